@@ -1,17 +1,22 @@
+import argparse
+import html
+import os
+import sqlite3
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy.stats import linregress
+from concurrent.futures import ProcessPoolExecutor
+from scipy.stats import t as t_dist
+from build_rollups import DEFAULT_ROLLUPS_PATH, PERCENTILES, BuildRollups
+from build_store import build_times_query
+from interactive_report import DEFAULT_HTML_POINTS, write_interactive_report
 
-# Load the data
-df = pd.read_csv("build_data.csv")
+DEFAULT_INPUT = "build_data.csv"
+DEFAULT_ROLLING_DAYS = 30
+UNIX_EPOCH_ORDINAL = pd.Timestamp("1970-01-01").toordinal()
+NS_PER_DAY = 86400 * 10**9
 
-# Convert "Human Readable Date" and "Time of Day" to datetime for analysis
-df["Date"] = pd.to_datetime(df["Human Readable Date"])
-df["Time"] = pd.to_datetime(df["Time of Day"], format="%H:%M:%S").dt.time
-
-# Combine date and time for precise timestamp analysis
-df["Timestamp"] = pd.to_datetime(df["Human Readable Date"] + " " + df["Time of Day"])
 
 # Build times in seconds for analysis
 build_columns = [
@@ -21,30 +26,184 @@ build_columns = [
     "Build ovn-kubernetes-amd64 (s)",
 ]
 
+DAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+DAY_OF_WEEK_DTYPE = pd.CategoricalDtype(DAY_ORDER, ordered=True)
+
+# Only what the analyses use is loaded; links and IDs stay on disk
+CSV_COLUMNS = ["PR Number", "Human Readable Date", "Time of Day", "Job Name", "Branch", *build_columns]
+CSV_DTYPES = {
+    "PR Number": "string",
+    "Human Readable Date": "string",
+    "Time of Day": "string",
+    "Job Name": "category",
+    "Branch": "category",
+    **{col: "float32" for col in build_columns},
+}
+
+
+def add_time_columns(df):
+    """Derive Date, Day of Week and Hour from the single parsed Timestamp column."""
+    df["Date"] = df["Timestamp"].dt.normalize()
+    df["Day of Week"] = df["Timestamp"].dt.day_name().astype(DAY_OF_WEEK_DTYPE)
+    df["Hour"] = df["Timestamp"].dt.hour.astype("int8")
+    return df
+
+
+def parse_utc_timestamp(value):
+    """Parse a --from/--to value as naive UTC, converting timezone-aware input (e.g. 2024-03-10T00:00Z)."""
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+    return timestamp
+
+
+def filter_builds(df, start=None, end=None, pr_numbers=None):
+    keep = pd.Series(True, index=df.index)
+    if start is not None:
+        keep &= df["Timestamp"] >= start
+    if end is not None:
+        keep &= df["Timestamp"] < end
+    if pr_numbers:
+        keep &= df["PR Number"].astype("string").isin([str(pr) for pr in pr_numbers])
+    return df[keep]
+
+
+def load_csv(path, start=None, end=None, pr_numbers=None, chunksize=None):
+    """Read build_data.csv with explicit dtypes and one timestamp parse.
+
+    With `chunksize`, the file is read that many rows at a time and each
+    chunk is filtered before being kept, so only the selected rows are ever
+    held in memory together.
+    """
+    reader = pd.read_csv(
+        path,
+        usecols=lambda col: col in CSV_COLUMNS,
+        dtype=CSV_DTYPES,
+        chunksize=chunksize,
+    )
+    chunks = reader if chunksize else [reader]
+
+    selected = []
+    for chunk in chunks:
+        timestamp_text = chunk.pop("Human Readable Date") + " " + chunk.pop("Time of Day")
+        chunk["Timestamp"] = pd.to_datetime(timestamp_text, format="%Y-%m-%d %H:%M:%S")
+        selected.append(filter_builds(chunk, start, end, pr_numbers))
+    df = pd.concat(selected, ignore_index=True) if selected else pd.DataFrame(columns=CSV_COLUMNS)
+    df["PR Number"] = df["PR Number"].astype("category")
+    for col in ("Job Name", "Branch"):
+        if col in df:
+            df[col] = df[col].astype("category")
+    return add_time_columns(df)
+
+
+def load_parquet(path, start=None, end=None, pr_numbers=None):
+    """Read a month-partitioned dataset written by getBuildData.py --format parquet.
+
+    Only the month=YYYY-MM partitions overlapping [start, end) are opened.
+    """
+    filters = []
+    if start is not None:
+        filters.append(("month", ">=", start.strftime("%Y-%m")))
+        filters.append(("Start DateTime", ">=", start.tz_localize("UTC")))
+    if end is not None:
+        filters.append(("month", "<=", end.strftime("%Y-%m")))
+        filters.append(("Start DateTime", "<", end.tz_localize("UTC")))
+    if pr_numbers:
+        filters.append(("PR Number", "in", list(pr_numbers)))
+    columns = ["PR Number", "Start DateTime", "Job Name", "Branch", *build_columns]
+    df = pd.read_parquet(path, columns=columns, filters=filters or None)
+
+    # Same columns as the CSV path, in naive UTC
+    df["Timestamp"] = df.pop("Start DateTime").dt.tz_convert("UTC").dt.tz_localize(None)
+    df = df.astype({"PR Number": "category", "Job Name": "category", "Branch": "category",
+                    **{col: "float32" for col in build_columns}})
+    return add_time_columns(df)
+
+
+def load_sqlite(path, start=None, end=None, pr_numbers=None):
+    """Query the build-history store written by getBuildData.py --format sqlite.
+
+    Date and PR filters run in SQLite against its indexes, so only the
+    matching runs are loaded into pandas.
+    """
+    build_names = [col.removeprefix("Build ").removesuffix(" (s)") for col in build_columns]
+    sql, params = build_times_query(
+        build_names,
+        start.strftime("%Y-%m-%d %H:%M:%S") if start is not None else None,
+        end.strftime("%Y-%m-%d %H:%M:%S") if end is not None else None,
+        pr_numbers,
+    )
+    with sqlite3.connect(path) as conn:
+        df = pd.read_sql_query(sql, conn, params=params)
+
+    df["Timestamp"] = pd.to_datetime(df.pop("Start Time"), format="%Y-%m-%d %H:%M:%S")
+    df = df.drop(columns=["Job ID", "Duration (ns)", "Spyglass Link", "Log URL"])
+    df = df.astype({"PR Number": "category", "Job Name": "category", "Branch": "category",
+                    **{col: "float32" for col in build_columns}})
+    return add_time_columns(df)
+
+
+def load_build_data(path, start=None, end=None, pr_numbers=None, chunksize=None):
+    """Load build data from a CSV file, a Parquet dataset directory or a SQLite store."""
+    if path.endswith((".sqlite", ".db")):
+        return load_sqlite(path, start, end, pr_numbers)
+    if os.path.isdir(path) or path.endswith(".parquet"):
+        return load_parquet(path, start, end, pr_numbers)
+    return load_csv(path, start, end, pr_numbers, chunksize)
+
+
+def print_memory_footprint(path, lean_df, start=None, end=None, pr_numbers=None, chunksize=None):
+    """Compare a default-dtype load of `path` with the typed frame actually used.
+
+    The default-dtype side goes through the same filters and chunking as
+    the real load, so the ratio measures the dtypes rather than the
+    --from/--to/--pr selection, and --chunksize still bounds memory.
+    """
+    reader = pd.read_csv(path, chunksize=chunksize)
+    before = rows = 0
+    for chunk in reader if chunksize else [reader]:
+        chunk["Date"] = pd.to_datetime(chunk["Human Readable Date"])
+        chunk["Time"] = pd.to_datetime(chunk["Time of Day"], format="%H:%M:%S").dt.time
+        chunk["Timestamp"] = pd.to_datetime(chunk["Human Readable Date"] + " " + chunk["Time of Day"])
+        kept = filter_builds(chunk, start, end, pr_numbers)
+        before += kept.memory_usage(deep=True).sum()
+        rows += len(kept)
+    after = lean_df.memory_usage(deep=True).sum()
+    per_row = f", {before / rows:.0f} -> {after / max(len(lean_df), 1):.0f} bytes/row" if rows else ""
+    print(f"Memory footprint ({len(lean_df)} rows): {before / 2**20:.2f} MiB with default dtypes, "
+          f"{after / 2**20:.2f} MiB typed, {before / max(after, 1):.1f}x smaller{per_row}")
+
+
 # 1. Overall trends over time
+def draw_trend(df, col, errorbar=("ci", 95)):
+    """Daily mean of `col`; the bootstrapped CI band is costly, so reports pass errorbar=None."""
+    plt.figure(figsize=(10, 6))
+    sns.lineplot(x="Date", y=col, data=df, marker="o", errorbar=errorbar)
+    plt.title(f"Trend of {col} Over Time")
+    plt.xlabel("Date")
+    plt.ylabel("Build Time (seconds)")
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+
+
 def plot_trends(df, columns):
     for col in columns:
-        plt.figure(figsize=(10, 6))
-        sns.lineplot(x="Date", y=col, data=df, marker="o")
-        plt.title(f"Trend of {col} Over Time")
-        plt.xlabel("Date")
-        plt.ylabel("Build Time (seconds)")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
+        draw_trend(df, col)
         plt.show(block=False)
 
 # 2. Correlation with day of the week
+def draw_day_of_week(df, col):
+    plt.figure(figsize=(10, 6))
+    sns.boxplot(x="Day of Week", y=col, data=df, order=DAY_ORDER)
+    plt.title(f"Build Time Distribution by Day of Week ({col})")
+    plt.xlabel("Day of Week")
+    plt.ylabel("Build Time (seconds)")
+    plt.tight_layout()
+
+
 def analyze_day_of_week(df, columns):
-    df["Day of Week"] = df["Date"].dt.day_name()
     for col in columns:
-        plt.figure(figsize=(10, 6))
-        sns.boxplot(x="Day of Week", y=col, data=df, order=[
-            "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"
-        ])
-        plt.title(f"Build Time Distribution by Day of Week ({col})")
-        plt.xlabel("Day of Week")
-        plt.ylabel("Build Time (seconds)")
-        plt.tight_layout()
+        draw_day_of_week(df, col)
         plt.show(block=False)
 
 """
@@ -61,16 +220,19 @@ def analyze_time_of_day(df, columns):
         plt.show(block=False)
 """
 
+def draw_time_of_day(df, col):
+    hourly_avg = df.groupby("Hour")[col].mean().reset_index()
+    plt.figure(figsize=(12, 6))
+    sns.lineplot(x="Hour", y=col, data=hourly_avg, marker="o")
+    plt.title(f"Average Build Time by Hour of Day ({col})")
+    plt.xlabel("Hour of Day")
+    plt.ylabel("Average Build Time (seconds)")
+    plt.tight_layout()
+
+
 def analyze_time_of_day_lineplot(df, columns):
-    df["Hour"] = pd.to_datetime(df["Time"], format="%H:%M:%S").dt.hour
     for col in columns:
-        hourly_avg = df.groupby("Hour")[col].mean().reset_index()
-        plt.figure(figsize=(12, 6))
-        sns.lineplot(x="Hour", y=col, data=hourly_avg, marker="o")
-        plt.title(f"Average Build Time by Hour of Day ({col})")
-        plt.xlabel("Hour of Day")
-        plt.ylabel("Average Build Time (seconds)")
-        plt.tight_layout()
+        draw_time_of_day(df, col)
         plt.show(block=False)
 
 # 4. Summary statistics
@@ -81,22 +243,358 @@ def print_summary_stats(df, columns):
         print(df[col].describe())
 
 # 5. Linear regression over time
+def ordinal_days(timestamps):
+    """Vectorized pd.Timestamp.toordinal: whole days, as used for the regression x axis."""
+    ns = timestamps.to_numpy(dtype="datetime64[ns]").astype("int64")
+    return (ns // NS_PER_DAY + UNIX_EPOCH_ORDINAL).astype("float64")
+
+
+def regress_columns(x, Y):
+    """Least-squares fit of every column of `Y` against `x` in one pass.
+
+    NaNs in `Y` are dropped per column, like dropna(subset=[col]) followed
+    by scipy.stats.linregress. Returns arrays of slope, intercept, r and
+    p-value (two-sided t-test on the slope), one entry per column.
+    """
+    Y = np.asarray(Y, dtype="float64")
+    mask = ~np.isnan(Y)
+    n = mask.sum(axis=0)
+    Y0 = np.where(mask, Y, 0.0)
+    X = np.where(mask, x[:, None], 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x = X.sum(axis=0) / n
+        mean_y = Y0.sum(axis=0) / n
+        dx = np.where(mask, x[:, None] - mean_x, 0.0)
+        dy = np.where(mask, Y0 - mean_y, 0.0)
+        sxx = (dx * dx).sum(axis=0)
+        syy = (dy * dy).sum(axis=0)
+        sxy = (dx * dy).sum(axis=0)
+
+        slope = sxy / sxx
+        intercept = mean_y - slope * mean_x
+        r = np.clip(sxy / np.sqrt(sxx * syy), -1.0, 1.0)
+        dof = n - 2
+        t_stat = r * np.sqrt(dof / ((1.0 - r) * (1.0 + r)))
+        p_value = 2 * t_dist.sf(np.abs(t_stat), dof)
+    p_value = np.where(np.abs(r) == 1.0, 0.0, p_value)
+    return slope, intercept, r, p_value
+
+
+def regression_results(df, columns):
+    slope, intercept, r, p_value = regress_columns(ordinal_days(df["Timestamp"]), df[columns])
+    return [
+        {
+            "Column": col,
+            "Slope (s/day)": slope[i],
+            "Intercept": intercept[i],
+            "R-squared": r[i] ** 2,
+            "P-value": p_value[i],
+        }
+        for i, col in enumerate(columns)
+    ]
+
+
+def rolling_regression(df, columns, window_days=DEFAULT_ROLLING_DAYS, min_points=5):
+    """Slope and r-squared of each column over a trailing time window, at every build.
+
+    The window ending at each build covers the preceding `window_days`.
+    Window sums come from prefix sums over the time-sorted rows, so the
+    cost is O(rows x columns) regardless of the window size. Windows with
+    fewer than `min_points` values give NaN. Returns a DataFrame indexed
+    by Timestamp with "<col> slope", "<col> r2" and "<col> n" columns.
+    """
+    df = df.sort_values("Timestamp")
+    timestamps = df["Timestamp"].to_numpy(dtype="datetime64[ns]")
+    x = ordinal_days(df["Timestamp"])
+    x = x - x.mean() if len(x) else x  # Centre x to keep the prefix sums well conditioned
+    Y = df[columns].to_numpy(dtype="float64")
+    mask = ~np.isnan(Y)
+    Y0 = np.where(mask, Y, 0.0)
+    X = np.where(mask, x[:, None], 0.0)
+
+    def prefix(values):
+        return np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+
+    sums = {
+        "n": prefix(mask.astype("float64")),
+        "x": prefix(X),
+        "y": prefix(Y0),
+        "xx": prefix(X * X),
+        "yy": prefix(Y0 * Y0),
+        "xy": prefix(X * Y0),
+    }
+    starts = np.searchsorted(timestamps, timestamps - np.timedelta64(window_days, "D"), side="right")
+    ends = np.arange(1, len(timestamps) + 1)
+    window = {key: values[ends] - values[starts] for key, values in sums.items()}
+
+    n = window["n"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sxx = window["xx"] - window["x"] ** 2 / n
+        syy = window["yy"] - window["y"] ** 2 / n
+        sxy = window["xy"] - window["x"] * window["y"] / n
+        slope = sxy / sxx
+        r2 = sxy ** 2 / (sxx * syy)
+    too_few = n < min_points
+    slope[too_few] = np.nan
+    r2[too_few] = np.nan
+
+    result = {}
+    for i, col in enumerate(columns):
+        result[f"{col} slope"] = slope[:, i]
+        result[f"{col} r2"] = r2[:, i]
+        result[f"{col} n"] = n[:, i].astype("int64")
+    return pd.DataFrame(result, index=pd.Index(df["Timestamp"].to_numpy(), name="Timestamp"))
+
+
+def draw_rolling_slope(df, col, window_days=DEFAULT_ROLLING_DAYS):
+    rolling = rolling_regression(df, [col], window_days)
+    plt.figure(figsize=(12, 6))
+    plt.plot(rolling.index, rolling[f"{col} slope"], marker=".")
+    plt.axhline(0, color="grey", linewidth=0.8)
+    plt.title(f"{window_days}-Day Rolling Regression Slope ({col})")
+    plt.xlabel("Date")
+    plt.ylabel("Slope (seconds/day)")
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+
+
+def plot_rolling_slopes(df, columns, window_days=DEFAULT_ROLLING_DAYS):
+    for col in columns:
+        draw_rolling_slope(df, col, window_days)
+        plt.show(block=False)
+
+
 def linear_regression_analysis(df, columns):
+    for result in regression_results(df, columns):
+        print(f"\nLinear Regression for {result['Column']}:")
+        print(f"Slope: {result['Slope (s/day)']:.2f} seconds/day")
+        print(f"Intercept: {result['Intercept']:.2f}")
+        print(f"R-squared: {result['R-squared']:.3f}")
+        print(f"P-value: {result['P-value']:.3f}")
+
+
+# 6. Percentiles from the rollup sketches
+def column_target(col):
+    return col.removeprefix("Build ").removesuffix(" (s)")
+
+
+def rollups_from_frame(df, columns):
+    """Build fresh rollups from loaded rows, e.g. to backfill history getBuildData.py never fed."""
+    rollups = BuildRollups()
+    job_names = df["Job Name"].astype("string").fillna("") if "Job Name" in df else ""
     for col in columns:
-        df_non_na = df.dropna(subset=[col])
-        slope, intercept, r_value, p_value, std_err = linregress(
-            df_non_na["Timestamp"].map(pd.Timestamp.toordinal), df_non_na[col]
+        rows = df[["Timestamp", col]].assign(job_name=job_names).dropna()
+        rollups.update(
+            (job_name, column_target(col), None, start.to_pydatetime(), float(seconds))
+            for job_name, start, seconds in zip(rows["job_name"], rows["Timestamp"], rows[col])
         )
-        print(f"\nLinear Regression for {col}:")
-        print(f"Slope: {slope:.2f} seconds/day")
-        print(f"Intercept: {intercept:.2f}")
-        print(f"R-squared: {r_value**2:.3f}")
-        print(f"P-value: {p_value:.3f}")
-
-# Run the analyses
-plot_trends(df, build_columns)
-analyze_day_of_week(df, build_columns)
-analyze_time_of_day_lineplot(df, build_columns)
-print_summary_stats(df, build_columns)
-linear_regression_analysis(df, build_columns)
-plt.show()
+    return rollups
+
+
+def percentile_table(rollups, col, dimension):
+    """p50/p90/p99 of one build column by hour or weekday, read from the rollups alone."""
+    table = pd.DataFrame.from_dict(
+        rollups.percentiles(column_target(col), dimension),
+        orient="index",
+        columns=[f"p{round(q * 100)}" for q in PERCENTILES],
+    )
+    if dimension == "hour":
+        table.index = table.index.astype(int)
+        return table.sort_index()
+    return table.reindex([day for day in DAY_ORDER if day in table.index])
+
+
+def draw_percentiles(rollups, col, dimension):
+    table = percentile_table(rollups, col, dimension)
+    plt.figure(figsize=(12, 6))
+    for name in table.columns:
+        plt.plot(table.index.astype(str), table[name], marker="o", label=name)
+    plt.title(f"Build Time Percentiles by {dimension.title()} ({col})")
+    plt.xlabel("Hour of Day" if dimension == "hour" else "Day of Week")
+    plt.ylabel("Build Time (seconds)")
+    plt.legend()
+    plt.tight_layout()
+
+
+def analyze_percentiles(rollups, columns):
+    for col in columns:
+        for dimension in ("hour", "weekday"):
+            print(f"\n{col} percentiles by {dimension}:")
+            print(percentile_table(rollups, col, dimension).round(1))
+            draw_percentiles(rollups, col, dimension)
+            plt.show(block=False)
+
+# 7. Headless report
+REPORT_FIGURES = {
+    "trend": draw_trend,
+    "day-of-week": draw_day_of_week,
+    "time-of-day": draw_time_of_day,
+    "rolling-slope": draw_rolling_slope,
+}
+REPORT_HEAD = (
+    "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>Build time report</title>\n"
+    "<style>body{font-family:sans-serif} img{max-width:48%} table{border-collapse:collapse}"
+    " td,th{border:1px solid #ccc;padding:2px 6px;text-align:right}</style></head><body>\n"
+)
+# Bootstrapping a 95% CI for every date takes seconds per figure on a long history
+REPORT_FIGURE_OPTIONS = {"trend": {"errorbar": None}}
+
+
+def render_figure(task):
+    """Draw one report figure and save it; runs in a worker process."""
+    kind, col, data, path, options = task
+    plt.switch_backend("Agg")
+    REPORT_FIGURES[kind](data, col, **options)
+    plt.savefig(path)
+    plt.close("all")
+    return path
+
+
+def write_report(df, columns, report_dir, figure_format="png", workers=None,
+                 rolling_days=DEFAULT_ROLLING_DAYS, rollups=None):
+    """Render every figure to `report_dir` in a process pool and write index.html.
+
+    Needs no display: figures are drawn with the Agg backend, and each
+    worker only receives the columns its figure uses. With `rollups`, the
+    page also gets p50/p90/p99 tables by hour and weekday. An empty
+    selection gives a page saying so, with no figures.
+    """
+    os.makedirs(report_dir, exist_ok=True)
+    index_path = os.path.join(report_dir, "index.html")
+    if df.empty:
+        with open(index_path, "w") as f:
+            f.write(REPORT_HEAD + "<h1>Build time report</h1>\n"
+                    "<p>No builds match the selected --from/--to/--pr range.</p>\n</body></html>\n")
+        return index_path
+
+    tasks = []
+    for kind in REPORT_FIGURES:
+        for col in columns:
+            slug = col.removeprefix("Build ").removesuffix(" (s)")
+            filename = f"{kind}-{slug}.{figure_format}"
+            data = df[["Timestamp", "Date", "Day of Week", "Hour", col]]
+            options = REPORT_FIGURE_OPTIONS.get(kind, {})
+            if kind == "rolling-slope":
+                options = {"window_days": rolling_days}
+            tasks.append((kind, col, data, os.path.join(report_dir, filename), options))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(render_figure, tasks))
+
+    summary = df[columns].describe().to_html(float_format="{:.1f}".format)
+    regression = pd.DataFrame(regression_results(df, columns)).to_html(
+        index=False, float_format="{:.3f}".format
+    )
+    percentile_html = ""
+    if rollups is not None:
+        percentile_html = "<h2>Percentiles</h2>\n" + "\n".join(
+            f"<h3>{html.escape(col)} by {dimension}</h3>\n"
+            + percentile_table(rollups, col, dimension).to_html(float_format="{:.1f}".format)
+            for col in columns for dimension in ("hour", "weekday")
+        ) + "\n"
+    sections = []
+    for kind in REPORT_FIGURES:
+        images = "\n".join(
+            f'<img src="{html.escape(os.path.basename(path))}" alt="{html.escape(col)}">'
+            for task_kind, col, _, path, _ in tasks if task_kind == kind
+        )
+        sections.append(f"<h2>{html.escape(kind.replace('-', ' ').title())}</h2>\n{images}")
+
+    with open(index_path, "w") as f:
+        f.write(
+            REPORT_HEAD
+            + f"<h1>Build time report</h1>\n<p>{len(df)} builds,"
+            f" {df['Timestamp'].min():%Y-%m-%d} to {df['Timestamp'].max():%Y-%m-%d}</p>\n"
+            f"<h2>Summary statistics</h2>\n{summary}\n"
+            f"<h2>Linear regression over time</h2>\n{regression}\n"
+            + percentile_html
+            + "\n".join(sections)
+            + "\n</body></html>\n"
+        )
+    return index_path
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Analyze image build times collected by getBuildData.py.")
+    parser.add_argument("--input", default=DEFAULT_INPUT,
+                        help=f"build_data CSV, Parquet dataset directory or .sqlite build-history store "
+                             f"(default: {DEFAULT_INPUT})")
+    parser.add_argument("--from", dest="start", type=parse_utc_timestamp,
+                        help="Only analyze builds started on or after this date (UTC)")
+    parser.add_argument("--to", dest="end", type=parse_utc_timestamp,
+                        help="Only analyze builds started before this date (UTC)")
+    parser.add_argument("--pr", dest="pr_numbers", type=int, action="append",
+                        help="Only analyze builds for this PR number. Repeatable")
+    parser.add_argument("--chunksize", type=int,
+                        help="Read a CSV input this many rows at a time, keeping only rows that pass the filters")
+    parser.add_argument("--memory-report", action="store_true",
+                        help="Print the loaded data's memory footprint next to a default-dtype CSV load")
+    parser.add_argument("--rolling-days", type=int, default=DEFAULT_ROLLING_DAYS,
+                        help=f"Window for the rolling regression plots (default: {DEFAULT_ROLLING_DAYS})")
+    parser.add_argument("--report", metavar="DIR",
+                        help="Render all figures to DIR with an index.html instead of opening windows")
+    parser.add_argument("--figure-format", choices=["png", "svg"], default="png",
+                        help="Image format for --report (default: png)")
+    parser.add_argument("--report-workers", type=int,
+                        help="Processes used to render --report figures (default: one per CPU)")
+    parser.add_argument("--html", metavar="FILE",
+                        help="Write one self-contained, zoomable HTML page instead of opening windows")
+    parser.add_argument("--html-points", type=int, default=DEFAULT_HTML_POINTS,
+                        help=f"Most points drawn per chart in --html (default: {DEFAULT_HTML_POINTS})")
+    parser.add_argument("--percentiles", action="store_true",
+                        help="Show p50/p90/p99 by hour and weekday from the --rollups sketches")
+    parser.add_argument("--rollups", default=DEFAULT_ROLLUPS_PATH,
+                        help=f"Rollup sketch file maintained by getBuildData.py --update-rollups "
+                             f"(default: {DEFAULT_ROLLUPS_PATH})")
+    parser.add_argument("--rebuild-rollups", action="store_true",
+                        help="Rebuild --rollups from the loaded input before analyzing")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    df = load_build_data(args.input, args.start, args.end, args.pr_numbers, args.chunksize)
+    if args.memory_report:
+        if os.path.isfile(args.input) and not args.input.endswith((".sqlite", ".db", ".parquet")):
+            print_memory_footprint(args.input, df, args.start, args.end, args.pr_numbers, args.chunksize)
+        else:
+            print(f"Memory footprint: {df.memory_usage(deep=True).sum() / 2**20:.2f} MiB typed ({len(df)} rows)")
+
+    rollups = None
+    if args.rebuild_rollups:
+        rollups = rollups_from_frame(df, build_columns)
+        rollups.save(args.rollups)
+        print(f"Rebuilt percentile rollups in {args.rollups}")
+    elif args.percentiles:
+        if not os.path.exists(args.rollups):
+            raise SystemExit(f"--percentiles: no rollups at {args.rollups}; "
+                             f"run getBuildData.py --update-rollups or use --rebuild-rollups")
+        rollups = BuildRollups.load(args.rollups)
+
+    if args.report or args.html:
+        if args.html:
+            write_interactive_report(df, build_columns, args.html, args.html_points)
+            print(f"Interactive report written to {args.html}")
+        if args.report:
+            plt.switch_backend("Agg")
+            index_path = write_report(df, build_columns, args.report, args.figure_format, args.report_workers,
+                                      args.rolling_days, rollups)
+            print(f"Report written to {index_path}")
+        return
+    if df.empty:
+        print("No builds match the selected --from/--to/--pr range.")
+        return
+
+    # Run the analyses
+    plot_trends(df, build_columns)
+    analyze_day_of_week(df, build_columns)
+    analyze_time_of_day_lineplot(df, build_columns)
+    print_summary_stats(df, build_columns)
+    linear_regression_analysis(df, build_columns)
+    plot_rolling_slopes(df, build_columns, args.rolling_days)
+    if rollups is not None:
+        analyze_percentiles(rollups, build_columns)
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Micro-benchmark for prow_history.extract_all_builds.
+
+Compares the in-place raw_decode extractor with the DOTALL regex it
+replaced. Pages are built from fixtures/job-history-page.html, scaled up to
+different build counts, with trailing HTML added after the array the way
+real job-history pages have it.
+
+    python3 benchmarks/bench_extract_all_builds.py [--repeat N]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from prow_history import ALL_BUILDS_MARKER, extract_all_builds  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "job-history-page.html")
+BUILD_COUNTS = [20, 200, 2000]
+TRAILING_HTML_BYTES = 256 * 1024
+
+
+def legacy_extract_all_builds(page_source):
+    match = re.search(r"var allBuilds = (\[.*?\]);", page_source, re.DOTALL)
+    if not match:
+        raise ValueError("Could not find allBuilds data in page source")
+    return json.loads(match.group(1))
+
+
+def scaled_page(template, builds, count):
+    """Return `template` with its allBuilds array grown to `count` entries."""
+    scaled = []
+    for i in range(count):
+        build = dict(builds[i % len(builds)])
+        build["ID"] = str(int(build["ID"]) - i)
+        scaled.append(build)
+    head, _, rest = template.partition(ALL_BUILDS_MARKER)
+    _, end = json.JSONDecoder().raw_decode(rest.lstrip())
+    tail = rest.lstrip()[end:]
+    padding = "<!-- " + "x" * TRAILING_HTML_BYTES + " -->\n"
+    return f"{head}{ALL_BUILDS_MARKER} {json.dumps(scaled)}{tail}{padding}"
+
+
+def check_fixture(page):
+    builds = extract_all_builds(page)
+    print(f"fixture: extract_all_builds found {len(builds)} builds")
+    try:
+        legacy = legacy_extract_all_builds(page)
+        print(f"fixture: legacy regex found {len(legacy)} builds")
+    except ValueError as e:
+        print(f"fixture: legacy regex failed ({e})")
+    return builds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="Timing loops per case (default: 20)")
+    args = parser.parse_args()
+
+    with open(FIXTURE) as f:
+        template = f.read()
+    builds = check_fixture(template)
+    # The legacy regex cannot parse titles containing "];", so time it on builds it can handle
+    clean_builds = [b for b in builds if "];" not in json.dumps(b)]
+
+    print(f"\n{'builds':>8} {'page KiB':>9} {'raw_decode ms':>14} {'regex ms':>10} {'speedup':>8}")
+    for count in BUILD_COUNTS:
+        page = scaled_page(template, clean_builds, count)
+        assert extract_all_builds(page) == legacy_extract_all_builds(page)
+        new = min(timeit.repeat(lambda: extract_all_builds(page), number=1, repeat=args.repeat))
+        old = min(timeit.repeat(lambda: legacy_extract_all_builds(page), number=1, repeat=args.repeat))
+        print(f"{count:>8} {len(page) // 1024:>9} {new * 1000:>14.3f} {old * 1000:>10.3f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
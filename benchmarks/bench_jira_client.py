@@ -0,0 +1,84 @@
+"""Benchmark jira_client.JiraClient against the bare-requests calls it replaced.
+
+Runs everything against jira_stand_in.py on localhost with an added
+per-request latency:
+
+- listing every sprint on the board, the old way (one requests.get and
+  one new connection per page) versus JiraClient.paginate on a keep-alive
+  session;
+- looking up one sprint repeatedly, uncached versus through the GET cache.
+
+    python3 benchmarks/bench_jira_client.py [--sprints N] [--latency S] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from jira_client import JiraClient  # noqa: E402
+from jira_stand_in import DEFAULT_BOARD_ID, FIRST_SPRINT_ID, JiraStandIn, JiraState  # noqa: E402
+
+HEADERS = {"Authorization": "Bearer benchmark", "Content-Type": "application/json"}
+
+
+def legacy_list_sprints(base_url):
+    """The loop find_new_sprint_id.py used to run: bare requests.get per page."""
+    sprints_url = f"{base_url}/rest/agile/1.0/board/{DEFAULT_BOARD_ID}/sprint"
+    start_at, max_results, sprints = 0, 50, []
+    while True:
+        response = requests.get(f"{sprints_url}?startAt={start_at}&maxResults={max_results}", headers=HEADERS)
+        data = response.json().get("values", [])
+        if not data:
+            break
+        sprints.extend(data)
+        start_at += max_results
+        if response.json().get("isLast", False):
+            break
+    return sprints
+
+
+def client_list_sprints(client):
+    return list(client.paginate(f"/rest/agile/1.0/board/{DEFAULT_BOARD_ID}/sprint", cache=False))
+
+
+def timed(stand_in, fn):
+    before = stand_in.stats
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    after = stand_in.stats
+    return result, elapsed, after["requests"] - before["requests"], after["connections"] - before["connections"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sprints", type=int, default=1000, help="Sprints on the stand-in board (default: 1000)")
+    parser.add_argument("--latency", type=float, default=0.005,
+                        help="Seconds added to every stand-in response (default: 0.005)")
+    parser.add_argument("--repeat", type=int, default=50, help="Repeated sprint lookups (default: 50)")
+    args = parser.parse_args()
+
+    with JiraStandIn(state=JiraState(sprint_count=args.sprints), latency=args.latency) as stand_in:
+        client = JiraClient(stand_in.url, token="benchmark")
+        sprint_path = f"/rest/agile/1.0/sprint/{FIRST_SPRINT_ID}"
+
+        cases = [
+            ("list sprints, bare requests", lambda: len(legacy_list_sprints(stand_in.url))),
+            ("list sprints, JiraClient", lambda: len(client_list_sprints(client))),
+            ("sprint lookup, bare requests",
+             lambda: [requests.get(f"{stand_in.url}{sprint_path}", headers=HEADERS).json()
+                      for _ in range(args.repeat)]),
+            ("sprint lookup, JiraClient cache", lambda: [client.get(sprint_path) for _ in range(args.repeat)]),
+        ]
+        print(f"{'case':<34} {'requests':>9} {'connections':>12} {'ms':>9}")
+        for name, fn in cases:
+            _, elapsed, request_count, connection_count = timed(stand_in, fn)
+            print(f"{name:<34} {request_count:>9} {connection_count:>12} {elapsed * 1000:>9.1f}")
+        print(client.summary())
+
+
+if __name__ == "__main__":
+    main()
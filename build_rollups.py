@@ -0,0 +1,202 @@
+"""Mergeable percentile rollups of build times.
+
+Every (job, build target) pair has one quantile sketch per hour of day,
+per weekday and per calendar day (all UTC). Sketches are DDSketch-style:
+durations fall into logarithmically spaced buckets, so any quantile is
+within `relative_accuracy` of the true value, two sketches merge by adding
+bucket counts (which is how jobs are combined for reporting), and a
+sketch's size depends on the spread of durations, not on how many builds
+were added. p50/p90/p99 dashboards therefore cost the same however much
+history sits behind them.
+"""
+import json
+import math
+import os
+from datetime import datetime, timezone
+
+DEFAULT_ROLLUPS_PATH = "build_rollups.json"
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DIMENSIONS = ("hour", "weekday", "day")
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+class QuantileSketch:
+    """Relative-error quantile sketch over positive values (DDSketch)."""
+
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        if value <= 0:
+            self.zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + 1
+        self.count += 1
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        """Return the q-quantile (0 <= q <= 1), or None for an empty sketch."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def to_dict(self):
+        return {"bins": {str(key): count for key, count in self.bins.items()},
+                "zero_count": self.zero_count, "count": self.count}
+
+    @classmethod
+    def from_dict(cls, data, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        sketch = cls(relative_accuracy)
+        sketch.bins = {int(key): count for key, count in data["bins"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        return sketch
+
+
+def to_utc(start):
+    """Return `start` (datetime, pandas Timestamp or ISO text) as an aware UTC datetime; naive means UTC."""
+    if not isinstance(start, datetime):
+        start = datetime.fromisoformat(str(start).replace("Z", "+00:00"))
+    if start.tzinfo is None:
+        return start.replace(tzinfo=timezone.utc)
+    return start.astimezone(timezone.utc)
+
+
+class BuildRollups:
+    """Quantile sketches by hour, weekday and day for each (job name, target), persisted as JSON.
+
+    The job IDs added to each (job name, target) are kept too, so builds
+    fed again by an overlapping crawl are not counted twice, and a run
+    that finished after newer ones is still added when it turns up.
+    """
+
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.sketches = {}  # (job name, target) -> dimension -> key -> QuantileSketch
+        self.seen_ids = {}  # (job name, target) -> set of job IDs already added
+
+    @classmethod
+    def load(cls, path=DEFAULT_ROLLUPS_PATH):
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            saved = json.load(f)
+        rollups = cls(saved["relative_accuracy"])
+        if "jobs" not in saved:
+            # Older files mixed every job into one target and deduped by start time
+            print(f"{path} predates per-job rollups; starting over "
+                  f"(analyzeBuildData.py --rebuild-rollups refills it from existing data)")
+            return rollups
+        for job_name, targets in saved["jobs"].items():
+            for target, data in targets.items():
+                rollups.seen_ids[(job_name, target)] = set(data["seen_ids"])
+                rollups.sketches[(job_name, target)] = {
+                    dimension: {
+                        key: QuantileSketch.from_dict(sketch, rollups.relative_accuracy)
+                        for key, sketch in sketches.items()
+                    }
+                    for dimension, sketches in data["sketches"].items()
+                }
+        return rollups
+
+    def save(self, path=DEFAULT_ROLLUPS_PATH):
+        jobs = {}
+        for (job_name, target), dimensions in self.sketches.items():
+            jobs.setdefault(job_name, {})[target] = {
+                "seen_ids": sorted(self.seen_ids.get((job_name, target), ())),
+                "sketches": {
+                    dimension: {key: sketch.to_dict() for key, sketch in sketches.items()}
+                    for dimension, sketches in dimensions.items()
+                },
+            }
+        data = {"relative_accuracy": self.relative_accuracy, "jobs": jobs}
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def add(self, job_name, target, start, seconds):
+        """Add one build duration started at `start` (naive values are taken as UTC)."""
+        start = to_utc(start)
+        keys = {
+            "hour": str(start.hour),
+            "weekday": start.strftime("%A"),
+            "day": start.strftime("%Y-%m-%d"),
+        }
+        dimensions = self.sketches.setdefault((job_name, target), {dimension: {} for dimension in DIMENSIONS})
+        for dimension, key in keys.items():
+            sketches = dimensions[dimension]
+            if key not in sketches:
+                sketches[key] = QuantileSketch(self.relative_accuracy)
+            sketches[key].add(seconds)
+
+    def update(self, observations):
+        """Add (job name, target, job ID, start, seconds) observations not added before.
+
+        Returns the number of observations added. A job ID already added
+        for its (job name, target) is skipped; a job ID of None (rows
+        without one, as in --rebuild-rollups) is always added.
+        """
+        added = 0
+        for job_name, target, job_id, start, seconds in observations:
+            if seconds is None or (isinstance(seconds, float) and math.isnan(seconds)):
+                continue
+            seen = self.seen_ids.setdefault((job_name, target), set())
+            if job_id is not None:
+                if job_id in seen:
+                    continue
+                seen.add(job_id)
+            self.add(job_name, target, start, seconds)
+            added += 1
+        return added
+
+    def _sketches(self, target, dimension, job_name=None):
+        """Yield (key, sketch) for `target` in one job, or in every job if `job_name` is None."""
+        for (sketch_job, sketch_target), dimensions in self.sketches.items():
+            if sketch_target == target and job_name in (None, sketch_job):
+                yield from dimensions.get(dimension, {}).items()
+
+    def percentiles(self, target, dimension, percentiles=PERCENTILES, first_day=None, last_day=None,
+                    job_name=None):
+        """Return {key: [quantile for each of `percentiles`]} for one target and dimension.
+
+        Sketches of every job are merged unless `job_name` picks one. For
+        the "day" dimension, `first_day`/`last_day` ("YYYY-MM-DD",
+        inclusive) limit the keys returned.
+        """
+        merged = {}
+        for key, sketch in self._sketches(target, dimension, job_name):
+            if dimension == "day" and ((first_day and key < first_day) or (last_day and key > last_day)):
+                continue
+            merged.setdefault(key, QuantileSketch(self.relative_accuracy)).merge(sketch)
+        return {key: [sketch.quantile(q) for q in percentiles] for key, sketch in merged.items()}
+
+    def merged(self, target, dimension, keys=None, job_name=None):
+        """Merge the sketches of `target` for `keys` (default all) into one, across jobs unless `job_name` is given."""
+        total = QuantileSketch(self.relative_accuracy)
+        for key, sketch in self._sketches(target, dimension, job_name):
+            if keys is None or key in keys:
+                total.merge(sketch)
+        return total
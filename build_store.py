@@ -0,0 +1,128 @@
+"""SQLite build-history store shared by getBuildData.py and analyzeBuildData.py.
+
+One row per Prow run in `builds` and one row per (run, build step) in
+`build_steps`, both upserted by job ID so re-crawling a run updates it in
+place. Start times are stored as UTC 'YYYY-MM-DD HH:MM:SS' text, which sorts
+and range-filters correctly under the start_time index.
+"""
+import sqlite3
+import threading
+
+DEFAULT_STORE_PATH = "build_history.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    job_id TEXT PRIMARY KEY,
+    job_name TEXT,
+    branch TEXT,
+    pr_number INTEGER,
+    start_time TEXT NOT NULL,
+    duration_ns INTEGER,
+    result TEXT,
+    spyglass_link TEXT,
+    log_url TEXT
+);
+CREATE INDEX IF NOT EXISTS builds_start_time ON builds (start_time);
+CREATE INDEX IF NOT EXISTS builds_pr_number ON builds (pr_number);
+
+CREATE TABLE IF NOT EXISTS build_steps (
+    job_id TEXT NOT NULL REFERENCES builds (job_id),
+    build_name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    seconds INTEGER,
+    PRIMARY KEY (job_id, build_name)
+);
+CREATE INDEX IF NOT EXISTS build_steps_build_name ON build_steps (build_name, job_id);
+"""
+
+BUILD_COLUMNS = [
+    "job_id", "job_name", "branch", "pr_number", "start_time",
+    "duration_ns", "result", "spyglass_link", "log_url",
+]
+
+
+class BuildStore:
+    """Indexed, upsert-only store of Prow runs and their build steps."""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def upsert(self, builds, steps=()):
+        """Insert or update runs and their steps in one transaction.
+
+        `builds` are dicts keyed by BUILD_COLUMNS; a None value never
+        overwrites something already stored. `steps` are dicts with job_id,
+        build_name, status and seconds.
+        """
+        assignments = ", ".join(
+            f"{column} = COALESCE(excluded.{column}, {column})" for column in BUILD_COLUMNS[1:]
+        )
+        build_sql = (
+            f"INSERT INTO builds ({', '.join(BUILD_COLUMNS)})"
+            f" VALUES ({', '.join('?' for _ in BUILD_COLUMNS)})"
+            f" ON CONFLICT (job_id) DO UPDATE SET {assignments}"
+        )
+        step_sql = (
+            "INSERT INTO build_steps (job_id, build_name, status, seconds) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (job_id, build_name) DO UPDATE SET"
+            " status = excluded.status, seconds = excluded.seconds"
+        )
+        with self._lock, self.conn:
+            self.conn.executemany(build_sql, [[build.get(column) for column in BUILD_COLUMNS] for build in builds])
+            self.conn.executemany(
+                step_sql,
+                [(step["job_id"], step["build_name"], step["status"], step["seconds"]) for step in steps],
+            )
+
+    def job_ids(self):
+        with self._lock:
+            return {row[0] for row in self.conn.execute("SELECT job_id FROM builds")}
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def build_times_query(build_names, start=None, end=None, pr_numbers=None, results=("SUCCESS",)):
+    """Return (sql, params) selecting one row per run with a column per build step.
+
+    The columns mirror build_data.csv (`Build <name> (s)`), plus
+    `Start Time` as UTC text. `start`/`end` bound the start time as
+    [start, end) and are compared as 'YYYY-MM-DD HH:MM:SS' strings. Like
+    the CSV, only successful runs are returned unless `results` says
+    otherwise (None for all).
+    """
+    step_columns = ", ".join(
+        f"MAX(CASE WHEN s.build_name = ? AND s.status = 'succeeded' THEN s.seconds END) AS \"Build {name} (s)\""
+        for name in build_names
+    )
+    params = list(build_names)
+    conditions = []
+    if start is not None:
+        conditions.append("b.start_time >= ?")
+        params.append(start)
+    if end is not None:
+        conditions.append("b.start_time < ?")
+        params.append(end)
+    if results:
+        conditions.append(f"b.result IN ({', '.join('?' for _ in results)})")
+        params.extend(results)
+    if pr_numbers:
+        conditions.append(f"b.pr_number IN ({', '.join('?' for _ in pr_numbers)})")
+        params.extend(pr_numbers)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = (
+        'SELECT b.job_id AS "Job ID", b.pr_number AS "PR Number", b.duration_ns AS "Duration (ns)",'
+        ' b.start_time AS "Start Time", b.spyglass_link AS "Spyglass Link", b.log_url AS "Log URL",'
+        ' b.job_name AS "Job Name", b.branch AS "Branch",'
+        f" {step_columns}"
+        " FROM builds b LEFT JOIN build_steps s ON s.job_id = b.job_id"
+        f" {where}"
+        " GROUP BY b.job_id"
+        " ORDER BY b.start_time DESC"
+    )
+    return sql, params
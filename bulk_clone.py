@@ -1,88 +1,164 @@
 import argparse
-import time
-import requests
+import json
+from jira_client import DEFAULT_JIRA_URL, JiraClient, JiraError, load_token
 
-parser = argparse.ArgumentParser(description='Clone a Jira issue multiple times with sprint info.')
-parser.add_argument('sprint_id', type=str, help='ID of the target sprint')
+# Jira's bulk-create and sprint-add endpoints accept at most this many issues per call
+BULK_CREATE_BATCH = 50
+SPRINT_ADD_BATCH = 50
+SEARCH_PAGE_SIZE = 100
+PLACEHOLDER = "[GENERIC_TO_BE_CLONED]"
+
+# Used when no --plan is given: the weekly checks cloned from CORENET-6030
+DEFAULT_PLAN = {
+    "project": "CORENET",
+    "templates": [
+        {
+            "source": "CORENET-6030",
+            "clones": [
+                {"label": "week1 check1", "assignee": "jluhrsen"},
+                {"label": "week1 check2", "assignee": "anusaxen"},
+                {"label": "week2 check1", "assignee": "jluhrsen"},
+                {"label": "week2 check2", "assignee": "anusaxen"},
+                {"label": "week3 check1", "assignee": "jluhrsen"},
+                {"label": "week3 check2", "assignee": "anusaxen"},
+            ],
+        }
+    ],
+}
+
+parser = argparse.ArgumentParser(
+    description='Clone Jira template issues into one or more sprints. Clones that already exist are skipped, '
+                'so a plan can be re-run safely.')
+parser.add_argument('sprint_ids', nargs='*', help='IDs of the target sprints (added to the plan\'s "sprints")')
+parser.add_argument('--plan', help='JSON plan with "project", "sprints" and "templates" '
+                                   '(see bulk_clone_plan.example.json); default: the CORENET-6030 weekly checks')
+parser.add_argument('--jira-url', default=DEFAULT_JIRA_URL, help=f'Jira base URL (default: {DEFAULT_JIRA_URL})')
+parser.add_argument('--dry-run', action='store_true', help='Show what would be created without creating it')
 args = parser.parse_args()
-sprint_id = args.sprint_id
+
+if args.plan:
+    with open(args.plan, 'r') as file:
+        plan = json.load(file)
+else:
+    plan = dict(DEFAULT_PLAN)
+sprint_ids = [str(sprint_id) for sprint_id in plan.get('sprints', [])] + args.sprint_ids
+sprint_ids = list(dict.fromkeys(sprint_ids))
+if not sprint_ids:
+    parser.error('no sprints given on the command line or in the plan')
+project = plan.get('project', 'CORENET')
 
 try:
-    with open('./jira_token', 'r') as file:
-        access_token = file.read().strip()
+    access_token = load_token()
 except Exception as e:
     print(f"Error reading token: {e}")
     exit(1)
 
-jira_url = 'https://issues.redhat.com'
-headers = {
-    'Authorization': f'Bearer {access_token}',
-    'Content-Type': 'application/json'
-}
+jira = JiraClient(args.jira_url, access_token)
+
+
+def jql_string(text):
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
 
-# Get the sprint name
-sprint_info_url = f'{jira_url}/rest/agile/1.0/sprint/{sprint_id}'
-sprint_response = requests.get(sprint_info_url, headers=headers)
-if sprint_response.status_code != 200:
-    print(f"Failed to fetch sprint info. Response: {sprint_response.text}")
-    exit(1)
 
-sprint_name = sprint_response.json()['name']
-print(f"Target sprint: {sprint_name}")
-time.sleep(0.5)
+def search_issues(jql, fields):
+    """Return every issue matching `jql`, exiting with the response on failure."""
+    try:
+        return list(jira.search(jql, fields, page_size=SEARCH_PAGE_SIZE))
+    except JiraError as e:
+        print(f"Search failed. JQL: {jql}\n{e}")
+        exit(1)
 
-# Get the source issue details
-source_issue_key = "CORENET-6030"
-issue_url = f'{jira_url}/rest/api/2/issue/{source_issue_key}'
-issue_response = requests.get(issue_url, headers=headers)
-if issue_response.status_code != 200:
-    print(f"Failed to fetch source issue. Response: {issue_response.text}")
+
+# Get the sprint names
+sprint_names = {}
+for sprint_id in sprint_ids:
+    sprint_response = jira.request('GET', f'/rest/agile/1.0/sprint/{sprint_id}')
+    if sprint_response.status_code != 200:
+        print(f"Failed to fetch sprint {sprint_id} info. Response: {sprint_response.text}")
+        exit(1)
+    sprint_names[sprint_id] = sprint_response.json()['name']
+    print(f"Target sprint: {sprint_names[sprint_id]}")
+
+# Get every template's source issue in one search
+source_keys = [template['source'] for template in plan['templates']]
+sources = {
+    issue['key']: issue['fields']
+    for issue in search_issues(f"key in ({', '.join(source_keys)})", ["summary", "description"])
+}
+missing = [key for key in source_keys if key not in sources]
+if missing:
+    print(f"Failed to fetch source issue(s): {', '.join(missing)}")
     exit(1)
 
-issue_data = issue_response.json()
-base_summary = issue_data['fields']['summary']
-description = issue_data['fields'].get('description', '')
-story_points = issue_data['fields'].get('customfield_12310243', 1)
-
-time.sleep(0.5)
-
-# Define clones
-checklist = [
-    ("week1 check1", "jluhrsen"),
-    ("week1 check2", "anusaxen"),
-    ("week2 check1", "jluhrsen"),
-    ("week2 check2", "anusaxen"),
-    ("week3 check1", "jluhrsen"),
-    ("week3 check2", "anusaxen"),
-]
-
-# Create clones
-for check_label, assignee in checklist:
-    new_summary = base_summary.replace("[GENERIC_TO_BE_CLONED]", f"[{check_label} {sprint_name}]")
-    create_issue_url = f'{jira_url}/rest/api/2/issue'
-    new_issue_data = {
-        "fields": {
-            "project": {"key": "CORENET"},
-            "issuetype": {"name": "Story"},
-            "summary": new_summary,
-            "description": description,
-            "assignee": {"name": assignee},
-            "priority": {"name": "Normal"}
+# Work out every clone the plan asks for
+wanted = []
+for sprint_id in sprint_ids:
+    for template in plan['templates']:
+        base_summary = sources[template['source']]['summary']
+        for clone in template['clones']:
+            new_summary = base_summary.replace(PLACEHOLDER, f"[{clone['label']} {sprint_names[sprint_id]}]")
+            wanted.append((sprint_id, new_summary, clone['assignee'], template['source']))
+
+# One pre-flight search finds clones from earlier runs, in the sprints or merely named after them
+name_terms = " OR ".join(f"summary ~ {jql_string(name)}" for name in sprint_names.values())
+existing_jql = f"project = {project} AND (sprint in ({', '.join(sprint_ids)}) OR {name_terms})"
+existing = {issue['fields']['summary']: issue['key'] for issue in search_issues(existing_jql, ["summary"])}
+
+to_create = []
+for sprint_id, new_summary, assignee, source_key in wanted:
+    if new_summary in existing:
+        print(f"Skipping {existing[new_summary]}, already exists:\n  {new_summary}")
+    else:
+        to_create.append((sprint_id, new_summary, assignee, source_key))
+print(f"{len(to_create)} of {len(wanted)} clones to create")
+if args.dry_run:
+    for sprint_id, new_summary, assignee, _ in to_create:
+        print(f"Would create for {assignee} in sprint {sprint_id}:\n  {new_summary}")
+    exit(0)
+
+# Create the clones with as few bulk requests as possible
+created = []
+for start in range(0, len(to_create), BULK_CREATE_BATCH):
+    batch = to_create[start:start + BULK_CREATE_BATCH]
+    issue_updates = [
+        {
+            "fields": {
+                "project": {"key": project},
+                "issuetype": {"name": "Story"},
+                "summary": new_summary,
+                "description": sources[source_key].get('description', ''),
+                "assignee": {"name": assignee},
+                "priority": {"name": "Normal"}
+            }
         }
-    }
+        for _, new_summary, assignee, source_key in batch
+    ]
+    create_response = jira.request('POST', '/rest/api/2/issue/bulk', json={"issueUpdates": issue_updates})
+    if create_response.status_code not in (201, 400):
+        print(f"Failed to create issues. Response: {create_response.text}")
+        exit(1)
 
-    create_response = requests.post(create_issue_url, headers=headers, json=new_issue_data)
-    time.sleep(0.5)
+    # Created issues come back in request order, skipping the failed elements
+    result = create_response.json()
+    failed = {error['failedElementNumber']: error for error in result.get('errors', [])}
+    created_issues = iter(result.get('issues', []))
+    for number, (sprint_id, new_summary, assignee, _) in enumerate(batch):
+        if number in failed:
+            print(f"Failed to create issue \"{new_summary}\". Response: {failed[number].get('elementErrors')}")
+            continue
+        created.append((sprint_id, next(created_issues)['key'], new_summary, assignee))
 
-    if create_response.status_code == 201:
-        new_issue_key = create_response.json()['key']
-        sprint_add_url = f'{jira_url}/rest/agile/1.0/sprint/{sprint_id}/issue'
-        sprint_response = requests.post(sprint_add_url, headers=headers, json={"issues": [new_issue_key]})
-        time.sleep(0.5)
+# Add the new issues to their sprints, one call per sprint (per 50 issues)
+for sprint_id in sprint_ids:
+    in_sprint = [clone for clone in created if clone[0] == sprint_id]
+    sprint_add_path = f'/rest/agile/1.0/sprint/{sprint_id}/issue'
+    for start in range(0, len(in_sprint), SPRINT_ADD_BATCH):
+        batch = in_sprint[start:start + SPRINT_ADD_BATCH]
+        sprint_response = jira.request('POST', sprint_add_path, json={"issues": [key for _, key, _, _ in batch]})
+        for _, new_issue_key, new_summary, assignee in batch:
+            if sprint_response.status_code == 204:
+                print(f"Created {new_issue_key} assigned to {assignee}:\n  {new_summary}")
+            else:
+                print(f"Failed to add {new_issue_key} to sprint. Response: {sprint_response.text}")
 
-        if sprint_response.status_code == 204:
-            print(f"Created {new_issue_key} assigned to {assignee}:\n  {new_summary}")
-        else:
-            print(f"Failed to add {new_issue_key} to sprint. Response: {sprint_response.text}")
-    else:
-        print(f"Failed to create issue. Response: {create_response.text}")
+print(jira.summary())
@@ -0,0 +1,43 @@
+"""requests transport adapter that counts the TCP connections it opens.
+
+Shared by getBuildData.HttpClient and jira_client.JiraClient so both
+report connection reuse the same way.
+"""
+import threading
+
+from requests.adapters import HTTPAdapter
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that counts the TCP connections it really opens.
+
+    urllib3's pool num_connections only counts brand-new connection
+    objects; a pooled connection whose socket was dropped (or closed after
+    a partial read) reconnects without being counted. Counting connect()
+    calls catches those reconnects too.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.connects = 0
+        self._connects_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def _count_connect(self):
+        with self._connects_lock:
+            self.connects += 1
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        adapter = self
+
+        def counting_pool(pool_cls):
+            class CountingConnection(pool_cls.ConnectionCls):
+                def connect(self):
+                    super().connect()
+                    adapter._count_connect()
+
+            return type(pool_cls.__name__, (pool_cls,), {"ConnectionCls": CountingConnection})
+
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: counting_pool(pool_cls) for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
@@ -1,15 +1,29 @@
 import argparse
-import requests
 import json
+import os
+import time
+from jira_client import DEFAULT_JIRA_URL, JiraClient, JiraError, load_token
+
+BOARD_ID = '19143'
+DEFAULT_INDEX_PATH = './sprint_index.json'
+DEFAULT_TTL_HOURS = 24
+MAX_RESULTS = 50
+# Re-read this many already indexed sprints so deleted sprints cannot shift the tail out of view
+REFRESH_OVERLAP = MAX_RESULTS
 
 parser = argparse.ArgumentParser(description='Find Jira sprint ID by name.')
 parser.add_argument('sprint_name', type=str, help='Name of the sprint to find')
+parser.add_argument('--index', default=DEFAULT_INDEX_PATH,
+                    help=f'Local sprint name->ID index (default: {DEFAULT_INDEX_PATH})')
+parser.add_argument('--ttl-hours', type=float, default=DEFAULT_TTL_HOURS,
+                    help=f'Rebuild the index from scratch once it is this old (default: {DEFAULT_TTL_HOURS})')
+parser.add_argument('--refresh', action='store_true', help='Ignore the index and rebuild it')
+parser.add_argument('--jira-url', default=DEFAULT_JIRA_URL, help=f'Jira base URL (default: {DEFAULT_JIRA_URL})')
 args = parser.parse_args()
 sprint_name = args.sprint_name
 
 try:
-    with open('./jira_token', 'r') as file:
-        access_token = file.read().strip()
+    access_token = load_token()
 except FileNotFoundError:
     print(f"Error: The file ./jira_token was not found.")
     exit(1)
@@ -17,43 +31,59 @@ except Exception as e:
     print(f"An error occurred: {e}")
     exit(1)
 
-JIRA_URL = 'https://issues.redhat.com'
-BOARD_ID = '19143'
-sprints_url = f'{JIRA_URL}/rest/agile/1.0/board/{BOARD_ID}/sprint'
-headers = {
-    'Authorization': f'Bearer {access_token}',
-    'Content-Type': 'application/json'
-}
-
-# Fetch sprints for the specified board
-start_at = 0
-max_results = 50
-sprints = []
-
-while True:
-    response = requests.get(f'{sprints_url}?startAt={start_at}&maxResults={max_results}', headers=headers)
-    if response.status_code == 200:
-        data = response.json().get('values', [])
-        if not data:
-            break
-        sprints.extend(data)
-        start_at += max_results
-        if response.json().get('isLast', False):
-            break
-    else:
-        print(f'Failed to fetch sprints: {response.status_code} - {response.text}')
-        print(f'Response: {response.json()}')
+jira = JiraClient(args.jira_url, access_token)
+sprints_path = f'/rest/agile/1.0/board/{BOARD_ID}/sprint'
+
+
+def new_index():
+    return {'board_id': BOARD_ID, 'created_at': time.time(), 'next_start': 0, 'sprints': {}}
+
+
+def load_index(path, ttl_hours):
+    """Return the saved index, or a new one if it is missing, expired or for another board."""
+    if not os.path.exists(path):
+        return new_index()
+    with open(path, 'r') as file:
+        index = json.load(file)
+    if index.get('board_id') != BOARD_ID or time.time() - index['created_at'] > ttl_hours * 3600:
+        return new_index()
+    return index
+
+
+def save_index(index, path):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as file:
+        json.dump(index, file)
+    os.replace(tmp_path, path)
+
+
+def refresh_until(index, name):
+    """Page through sprints past the indexed ones, stopping once `name` shows up.
+
+    The board lists sprints oldest first, so new sprints are always at the
+    end: paging starts just before `next_start` instead of at 0, and the
+    lazy page generator is abandoned as soon as the name is found.
+    """
+    start_at = max(0, index['next_start'] - REFRESH_OVERLAP)
+    try:
+        for position, sprint in enumerate(jira.paginate(sprints_path, start_at=start_at, page_size=MAX_RESULTS,
+                                                        cache=False), start=start_at):
+            index['sprints'][sprint['name']] = sprint['id']
+            index['next_start'] = max(index['next_start'], position + 1)
+            if sprint['name'] == name:
+                return
+    except JiraError as e:
+        print(f'Failed to fetch sprints: {e}')
         exit(1)
 
-# Check if any sprints were fetched
-if sprints:
-    for sprint in sprints:
-        if sprint['name'] == sprint_name:
-            sprint_id = sprint['id']
-            print(f'Sprint ID for "{sprint_name}": {sprint_id}')
-            break
-    else:
-        print(f'No sprint found with the name "{sprint_name}"')
-else:
-    print(f'No sprints were fetched.')
 
+index = new_index() if args.refresh else load_index(args.index, args.ttl_hours)
+if sprint_name not in index['sprints']:
+    refresh_until(index, sprint_name)
+    save_index(index, args.index)
+
+if sprint_name in index['sprints']:
+    print(f'Sprint ID for "{sprint_name}": {index["sprints"][sprint_name]}')
+else:
+    print(f'No sprint found with the name "{sprint_name}"')
+print(f'({len(index["sprints"])} sprints indexed in {args.index}; {jira.summary()})')
@@ -7,6 +7,7 @@ if [ "$#" -ne 1 ]; then
 fi
 
 JOB_NAME="$1"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 URL="https://prow.ci.openshift.org/job-history/gs/test-platform-results/pr-logs/directory/${JOB_NAME}"
 
 # Fetch the page
@@ -14,8 +15,7 @@ PAGE_CONTENT=$(curl -s "$URL")
 
 # Extract the 'allBuilds' JavaScript array and parse it to get the URL of the most recent successful job
 SUCCESSFUL_JOB_URL=$(echo "$PAGE_CONTENT" | \
-    awk '/var allBuilds =/,/];/' | \
-    sed 's/var allBuilds = //' | sed 's/;$//' | \
+    python3 "$SCRIPT_DIR/prow_history.py" | \
     jq -r '.[] | select(.Result == "SUCCESS") | .SpyglassLink' | \
     sort -r | head -n 1)
 
@@ -1,30 +1,262 @@
+import argparse
+import contextlib
 import requests
 import json
 import re
+import sqlite3
+import sys
+import threading
+import time
+import os
+import queue
+import random
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from urllib.parse import urlparse
+from build_rollups import DEFAULT_ROLLUPS_PATH, BuildRollups
+from build_store import DEFAULT_STORE_PATH, BuildStore
+from counting_adapter import CountingHTTPAdapter
+from prow_history import extract_all_builds
+from regression_detector import DEFAULT_ALERTS_PATH, DEFAULT_STATE_PATH, RegressionMonitor, append_alerts
 
 BRANCH = "master"
+JOB_TEMPLATE = "pull-ci-openshift-ovn-kubernetes-{branch}-images"
 BASE_URL = "https://prow.ci.openshift.org"
-JOB_HISTORY_URL = f"{BASE_URL}/job-history/gs/test-platform-results/pr-logs/directory/pull-ci-openshift-ovn-kubernetes-{BRANCH}-images"
+GCSWEB_URL = "https://gcsweb-ci.apps.ci.l2s4.p1.openshiftapps.com/gcs"
+JOB_HISTORY_BASE = f"{BASE_URL}/job-history/gs/test-platform-results/pr-logs/directory"
 CUTOFF_DATE = datetime(2024, 5, 1, tzinfo=timezone.utc)
+OUTPUT_CSV = "build_data.csv"
+OUTPUT_PARQUET_DIR = "build_data_parquet"
+OUTPUT_STEPS_CSV = "build_steps.csv"
+DEFAULT_CHECKPOINT_PATH = "getBuildData.checkpoint.json"
+BUILD_TARGETS = [
+    "src-amd64",
+    "ovn-kubernetes-base-amd64",
+    "ovn-kubernetes-microshift-amd64",
+    "ovn-kubernetes-amd64",
+]
+# ci-operator durations: "45s", "5m37s" or "1h2m3s"
+DURATION_PATTERN = r"(?:\d+h)?(?:\d+m)?\d+s"
+BUILD_SUCCEEDED_RE = re.compile(rf"Build (\S+?) succeeded after ({DURATION_PATTERN})")
+BUILD_STEP_RE = re.compile(rf"Build (\S+?) (succeeded|failed)(?: after ({DURATION_PATTERN}))?")
+LOG_CHUNK_SIZE = 64 * 1024
+STEP_GRAPH_ARTIFACT = "artifacts/ci-operator-step-graph.json"
+ARCH_SUFFIXES = ("-amd64", "-arm64", "-ppc64le", "-s390x")
+DEFAULT_WORKERS = 8
+DEFAULT_PREFETCH_PAGES = 2
+MAX_SEEK_PROBES = 32
+DEFAULT_OVERLAP_PAGES = 1
+DEFAULT_PER_HOST = 4
+DEFAULT_PARALLEL_JOBS = 4
+DEFAULT_RATE_LIMIT = 20
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 60
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+DEFAULT_CACHE_PATH = "build_times_cache.sqlite"
+DEFAULT_CACHE_MAX_AGE_DAYS = 365
+DEFAULT_CACHE_MAX_ENTRIES = 50000
+
+
+class HostLimiter:
+    """Cap the number of in-flight requests to any single host."""
+
+    def __init__(self, per_host=DEFAULT_PER_HOST):
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def __call__(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self._semaphores[host]
+
+
+host_limiter = HostLimiter()
+
+
+class RateLimiter:
+    """Token bucket shared by every request, whichever job it belongs to."""
+
+    def __init__(self, rate=DEFAULT_RATE_LIMIT):
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self):
+        if not self.rate or self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+        if slot > now:
+            time.sleep(slot - now)
+
+
+rate_limiter = RateLimiter()
+
+
+class HttpClient:
+    """Shared keep-alive session with bounded, jittered retries.
+
+    Every request goes through one requests.Session so connections to Prow
+    and gcsweb are pooled instead of paying a TCP+TLS handshake each time.
+    Connection errors, timeouts and 429/5xx responses are retried up to
+    `retries` times, sleeping a random fraction of `backoff * 2**attempt`
+    (or the server's Retry-After, if it sent one).
+    """
+
+    def __init__(self, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 pool_size=DEFAULT_WORKERS):
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries_performed = 0
+        self.bytes_read = 0
+        self._lock = threading.Lock()
+        self.session = requests.Session()
+        self.resize_pool(pool_size)
+
+    def resize_pool(self, pool_size):
+        adapter = CountingHTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _retry_delay(self, attempt, response):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return int(retry_after)
+        return random.uniform(0, self.backoff * 2 ** attempt)
+
+    def get(self, url, limit_host=True, **kwargs):
+        """GET `url` with retries, holding a host_limiter slot for the request.
+
+        A streamed body is read after get() returns, so callers passing
+        stream=True hold the slot themselves and pass `limit_host=False`.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            response = None
+            try:
+                rate_limiter.acquire()
+                with host_limiter(url) if limit_host else contextlib.nullcontext():
+                    response = self.session.get(url, **kwargs)
+                if response.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                    return response
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.retries:
+                    raise
+            if response is not None:
+                response.close()
+            time.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+            with self._lock:
+                self.retries_performed += 1
+
+    def record_bytes(self, count):
+        with self._lock:
+            self.bytes_read += count
+
+    def stats(self):
+        """Return request, connection and retry counters from the pools."""
+        requests_sent = connections_opened = 0
+        adapters = {id(adapter): adapter for adapter in self.session.adapters.values()}
+        for adapter in adapters.values():
+            connections_opened += getattr(adapter, "connects", 0)
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                requests_sent += pools[key].num_requests
+        return {
+            "requests": requests_sent,
+            "connections_opened": connections_opened,
+            "connections_reused": max(0, requests_sent - connections_opened),
+            "retries": self.retries_performed,
+            "bytes_read": self.bytes_read,
+        }
+
+
+http = HttpClient()
+
+
+class BuildTimesCache:
+    """On-disk cache of parsed build times keyed by Prow job ID.
+
+    A finished job's build-log.txt never changes, so once its build times
+    have been parsed there is no reason to download it again. Entries older
+    than `max_age_days` are dropped, and only the newest `max_entries` are
+    kept, when the cache is opened.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_age_days=DEFAULT_CACHE_MAX_AGE_DAYS,
+                 max_entries=DEFAULT_CACHE_MAX_ENTRIES, table="build_times"):
+        self.path = path
+        self.table = table
+        self.max_age_days = max_age_days
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " job_id TEXT PRIMARY KEY,"
+            " build_times TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_fetched_at ON {table} (fetched_at)"
+        )
+        self.evict()
+
+    def evict(self):
+        with self._lock, self._conn:
+            if self.max_age_days is not None:
+                cutoff = time.time() - self.max_age_days * 86400
+                self._conn.execute(f"DELETE FROM {self.table} WHERE fetched_at < ?", (cutoff,))
+            if self.max_entries is not None:
+                self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE job_id NOT IN ("
+                    f" SELECT job_id FROM {self.table} ORDER BY fetched_at DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT build_times FROM {self.table} WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, job_id, build_times):
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (job_id, build_times, fetched_at) VALUES (?, ?, ?)",
+                (job_id, json.dumps(build_times), time.time()),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
 
 
 def fetch_page(url):
-    response = requests.get(url)
+    response = http.get(url)
     response.raise_for_status()
+    http.record_bytes(len(response.content))
     return response.text
 
 
-def extract_all_builds(page_source):
-    # Extract `allBuilds` JSON data
-    match = re.search(r"var allBuilds = (\[.*?\]);", page_source, re.DOTALL)
-    if not match:
-        raise ValueError("Could not find allBuilds data in page source")
-    all_builds_json = match.group(1)
-    return json.loads(all_builds_json)
-
-
 def get_older_runs_link(page_source):
     # Extract the "Older Runs" link
     match = re.search(r'<a href="(/job-history/[^"]+?)">&lt;- Older Runs</a>', page_source)
@@ -33,44 +265,333 @@ def get_older_runs_link(page_source):
     return None
 
 
+def job_history_url(job_name):
+    return f"{JOB_HISTORY_BASE}/{job_name}"
+
+
+def build_log_url(spyglass_path):
+    """Map a Spyglass path (/view/gs/<bucket>/...) to the run's build-log.txt on gcsweb."""
+    return GCSWEB_URL + spyglass_path.removeprefix("/view/gs") + "/build-log.txt"
+
+
+def parse_started(build):
+    return datetime.fromisoformat(build["Started"].replace("Z", "+00:00"))
+
+
+def page_predates_cutoff(builds, cutoff=None):
+    """True if the oldest build on a page started before `cutoff` (default CUTOFF_DATE)."""
+    starts = [parse_started(build) for build in builds if build.get("Started")]
+    if not starts:
+        return False
+    return min(starts) < (cutoff or CUTOFF_DATE)
+
+
+def seek_build_id(job_name, until):
+    """Find a buildId cursor whose history page starts near `until`.
+
+    Prow build IDs grow with start time, and ?buildId=N shows the runs
+    older than N. Instead of walking "Older Runs" pages from today, probe
+    IDs by interpolating between the closest (ID, start time) samples seen
+    so far, keeping to the middle of the bracket so a skewed guess still
+    halves it. No run started before `until` is newer than the returned
+    cursor, so none in the window is skipped. Usually the cursor's page
+    straddles `until`; if the probes run out, the cursor is the oldest
+    run known to be at or after `until`, and the crawl may first read some
+    pages of newer runs. Returns None when the newest page already reaches
+    `until`.
+    """
+    builds = extract_all_builds(fetch_page(job_history_url(job_name)))
+    samples = sorted((int(build["ID"]), parse_started(build)) for build in builds if build.get("Started"))
+    if not samples or samples[0][1] < until:
+        return None
+
+    hi_id, hi_time = samples[0]  # Oldest run seen that is still at or after `until`
+    ids_per_second = None
+    if len(samples) > 1 and samples[-1][1] > hi_time:
+        ids_per_second = (samples[-1][0] - hi_id) / (samples[-1][1] - hi_time).total_seconds()
+    lo_id = lo_time = None  # Newest cursor known to see only runs before `until`
+
+    for _ in range(MAX_SEEK_PROBES):
+        if lo_id is not None and hi_id - lo_id <= 1:
+            break
+        if lo_id is None:
+            # Nothing older known yet: extrapolate, or halve if there is no slope
+            if ids_per_second:
+                guess = int(hi_id - ids_per_second * (hi_time - until).total_seconds())
+            else:
+                guess = hi_id // 2
+            guess = max(1, min(guess, hi_id - 1))
+        else:
+            fraction = 0.5
+            if lo_time is not None and hi_time > lo_time:
+                fraction = (until - lo_time) / (hi_time - lo_time)
+            fraction = min(max(fraction, 0.1), 0.9)
+            guess = int(lo_id + fraction * (hi_id - lo_id))
+            guess = max(lo_id + 1, min(guess, hi_id - 1))
+
+        page = extract_all_builds(fetch_page(f"{job_history_url(job_name)}?buildId={guess}"))
+        page_samples = sorted((int(build["ID"]), parse_started(build)) for build in page if build.get("Started"))
+        if not page_samples:
+            lo_id, lo_time = guess, None
+            continue
+        oldest, newest = page_samples[0], page_samples[-1]
+        if newest[1] < until:
+            lo_id, lo_time = guess, newest[1]
+        elif oldest[1] >= until:
+            hi_id, hi_time = oldest
+        else:
+            return guess  # The page straddles `until`
+
+    return hi_id + 1
+
+
+def iter_history_pages(url, prefetch=DEFAULT_PREFETCH_PAGES, cutoff=None):
+    """Yield (url, page_source, builds) for each job-history page, newest first.
+
+    With `prefetch > 0` a background thread follows the "Older Runs" links
+    up to `prefetch` pages ahead of the consumer, so page downloads overlap
+    with the log fetching done for earlier pages. Closing the generator
+    stops the producer. Paging ends after the first page that reaches back
+    past `cutoff` (default CUTOFF_DATE).
+    """
+    if prefetch <= 0:
+        while url:
+            page_source = fetch_page(url)
+            builds = extract_all_builds(page_source)
+            yield url, page_source, builds
+            if page_predates_cutoff(builds, cutoff):
+                return
+            url = get_older_runs_link(page_source)
+        return
+
+    pages = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(url):
+        try:
+            while url and not stop.is_set():
+                page_source = fetch_page(url)
+                builds = extract_all_builds(page_source)
+                if not put((url, page_source, builds)):
+                    return
+                if page_predates_cutoff(builds, cutoff):
+                    break
+                url = get_older_runs_link(page_source)
+        except Exception as e:
+            put(e)
+            return
+        put(done)
+
+    producer = threading.Thread(target=produce, args=(url,), name="page-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = pages.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
 def convert_duration_to_seconds(duration_str):
-    """Convert a duration like '5m37s' to total seconds."""
-    match = re.match(r'(?:(\d+)m)?(?:(\d+)s)?', duration_str)
+    """Convert a duration like '5m37s' or '1h2m3s' to total seconds."""
+    match = re.match(r'(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?', duration_str)
     if not match:
         return None
-    minutes = int(match.group(1)) if match.group(1) else 0
-    seconds = int(match.group(2)) if match.group(2) else 0
-    return minutes * 60 + seconds
+    hours = int(match.group(1)) if match.group(1) else 0
+    minutes = int(match.group(2)) if match.group(2) else 0
+    seconds = int(match.group(3)) if match.group(3) else 0
+    return hours * 3600 + minutes * 60 + seconds
 
 
-def fetch_build_times(log_url):
-    """Fetch and parse build times from the log."""
-    try:
-        response = requests.get(log_url)
-        response.raise_for_status()
-        log_content = response.text
+def scan_build_log(lines, targets=None):
+    """Collect build times from log lines, stopping once every target is seen.
 
-        build_times = {}
-        matches = re.findall(r"Build (\S+?) succeeded after (\d+m\d+s)", log_content)
-        for build_name, duration in matches:
+    With `targets=None` the whole log is scanned and every successful build
+    is returned.
+    """
+    remaining = set(targets) if targets else None
+    build_times = {}
+    for line in lines:
+        for build_name, duration in BUILD_SUCCEEDED_RE.findall(line):
             build_times[build_name] = convert_duration_to_seconds(duration)
+            if remaining is not None:
+                remaining.discard(build_name)
+        if remaining is not None and not remaining:
+            break
+    return build_times
 
-        return build_times
+
+def scan_build_steps(lines):
+    """Collect every build step in a log, successful or failed.
+
+    Returns {build name: {"status": "succeeded"|"failed", "seconds": int|None}}.
+    Failed builds are not always logged with a duration.
+    """
+    steps = {}
+    for line in lines:
+        for build_name, status, duration in BUILD_STEP_RE.findall(line):
+            seconds = convert_duration_to_seconds(duration) if duration else None
+            steps[build_name] = {"status": status, "seconds": seconds}
+    return steps
+
+
+def scan_remote_log(log_url, scanner):
+    """Stream a log in chunks through `scanner`, closing the connection when it returns.
+
+    A response abandoned before its end cannot go back to the pool, so an
+    early exit gives up keep-alive: the next log fetch from the same host
+    opens a fresh TCP+TLS connection. For multi-MB logs that is still far
+    cheaper than reading the rest of the body.
+
+    The host_limiter slot is held until the body is closed, so --per-host
+    bounds concurrent downloads, not just concurrent header exchanges.
+    """
+    try:
+        with host_limiter(log_url):
+            response = http.get(log_url, stream=True, limit_host=False)
+            try:
+                response.raise_for_status()
+                if response.encoding is None:
+                    response.encoding = "utf-8"
+                lines = response.iter_lines(chunk_size=LOG_CHUNK_SIZE, decode_unicode=True)
+                return scanner(lines)
+            finally:
+                if hasattr(response.raw, "tell"):
+                    http.record_bytes(response.raw.tell())
+                response.close()
     except Exception as e:
         print(f"Error fetching log from {log_url}: {e}")
         return {}
 
 
-def parse_build_data(builds):
-    build_data = []
+def fetch_build_times(log_url, targets=BUILD_TARGETS):
+    """Fetch and parse build times from the log.
+
+    The log is streamed in chunks and the connection is dropped as soon as
+    all of `targets` have been found, so most of a multi-MB log is never
+    downloaded (at the cost of keep-alive, see scan_remote_log). Pass
+    `targets=None` to read the whole log.
+    """
+    return scan_remote_log(log_url, lambda lines: scan_build_log(lines, targets))
+
+
+def fetch_build_steps(log_url):
+    """Fetch a log and return every build step in it (see scan_build_steps)."""
+    return scan_remote_log(log_url, scan_build_steps)
+
+
+def step_graph_build_times(steps, targets=BUILD_TARGETS):
+    """Map ci-operator step-graph entries to build times for `targets`.
+
+    Image build steps are named without the architecture suffix that the
+    build log uses (`src` vs. `src-amd64`), so a target also matches the
+    step named after its base name. Failed or unfinished steps are ignored.
+    Returns None unless every target was found.
+    """
+    durations = {}
+    for step in steps:
+        if step.get("failed") or step.get("duration") is None:
+            continue
+        durations[step.get("name")] = round(step["duration"] / 1e9)
+
+    build_times = {}
+    for target in targets:
+        base = next((target[:-len(suffix)] for suffix in ARCH_SUFFIXES if target.endswith(suffix)), target)
+        for name in (target, base):
+            if name in durations:
+                build_times[target] = durations[name]
+                break
+        else:
+            return None
+    return build_times
+
+
+def fetch_build_times_from_artifacts(log_url, targets=BUILD_TARGETS):
+    """Fetch build times from the run's step-graph artifact, falling back to the log.
+
+    ci-operator-step-graph.json is a few KB of structured step timings,
+    versus a multi-MB build-log.txt. The log is only read when the artifact
+    is missing, unreadable or lacks one of the targets.
+    """
+    artifact_url = log_url.rsplit("/", 1)[0] + "/" + STEP_GRAPH_ARTIFACT
+    try:
+        response = http.get(artifact_url)
+        http.record_bytes(len(response.content))
+        if response.status_code == 200:
+            build_times = step_graph_build_times(response.json(), targets)
+            if build_times is not None:
+                return build_times
+    except (requests.RequestException, ValueError, AttributeError, TypeError, KeyError):
+        pass
+    return fetch_build_times(log_url, targets)
+
+
+FETCH_STRATEGIES = {
+    "log": fetch_build_times,
+    "artifacts": fetch_build_times_from_artifacts,
+}
+
+
+def cached_fetch_build_times(job_id, log_url, cache=None, fetch=fetch_build_times):
+    """Return build times for a job, downloading its log only on a cache miss."""
+    if cache is not None:
+        build_times = cache.get(job_id)
+        if build_times is not None:
+            return build_times
+    build_times = fetch(log_url)
+    # An empty result means the fetch failed; leave it uncached so it is retried
+    if cache is not None and build_times:
+        cache.put(job_id, build_times)
+    return build_times
+
+
+def parse_build_data(builds, workers=1, cache=None, job_name=None, branch=BRANCH, layout="wide",
+                     fetch_strategy="log", since=None, until=None):
+    """Turn one page of builds into CSV rows.
+
+    Build logs are fetched with up to `workers` threads; rows come back in
+    the same order as `builds` regardless of which download finishes first.
+    Jobs already in `cache` are not downloaded at all.
+
+    The "wide" layout has one row per successful job with a column for each
+    of BUILD_TARGETS. The "long" layout has one row per build step found in
+    the log, for every finished job, including steps that failed.
+
+    `fetch_strategy` picks how wide-layout build times are obtained; see
+    FETCH_STRATEGIES. Only builds started in [since, until) are kept;
+    `since` defaults to CUTOFF_DATE and `until` to no limit.
+    """
+    since = since or CUTOFF_DATE
+    long_layout = layout == "long"
+    candidates = []
     for build in builds:
-        if build.get("Result") != "SUCCESS":
+        result = build.get("Result")
+        if long_layout:
+            if result in (None, "", "PENDING"):
+                continue  # Still running, the log is incomplete
+        elif result != "SUCCESS":
             continue
 
         job_id = build.get("ID")
         started = build.get("Started")
         duration = build.get("Duration")
-        spyglass_link = BASE_URL + build.get("SpyglassLink")
+        spyglass_path = build.get("SpyglassLink")
+        spyglass_link = BASE_URL + spyglass_path
 
         refs = build.get("Refs", {})
         pulls = refs.get("pulls", [])
@@ -78,26 +599,54 @@ def parse_build_data(builds):
 
         # Convert start time to day of the week and time of day
         start_datetime = datetime.fromisoformat(started.replace("Z", "+00:00"))
-        if start_datetime < CUTOFF_DATE:
+        if start_datetime < since:
             continue  # Skip builds earlier than the cutoff date
+        if until is not None and start_datetime >= until:
+            continue
+
+        # Construct log URL
+        log_url = build_log_url(spyglass_path)
+        candidates.append((job_id, pr_number, duration, spyglass_link, start_datetime, result, log_url))
+
+    # Fetch build times from the logs
+    job_ids = [candidate[0] for candidate in candidates]
+    log_urls = [candidate[-1] for candidate in candidates]
+    caches = [cache] * len(candidates)
+    fetches = [fetch_build_steps if long_layout else FETCH_STRATEGIES[fetch_strategy]] * len(candidates)
+    if workers > 1 and len(log_urls) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            all_build_times = list(executor.map(cached_fetch_build_times, job_ids, log_urls, caches, fetches))
+    else:
+        all_build_times = list(map(cached_fetch_build_times, job_ids, log_urls, caches, fetches))
+
+    build_data = []
+    for candidate, build_times in zip(candidates, all_build_times):
+        job_id, pr_number, duration, spyglass_link, start_datetime, result, log_url = candidate
 
         day_of_week = start_datetime.strftime("%A")
         time_of_day = start_datetime.strftime("%H:%M:%S")
         human_readable_date = start_datetime.strftime("%Y-%m-%d")
 
-        # Construct log URL
-        log_url = (
-            f"https://gcsweb-ci.apps.ci.l2s4.p1.openshiftapps.com/gcs"
-            f"/test-platform-results/pr-logs/pull/openshift_ovn-kubernetes/{pr_number}"
-            f"/pull-ci-openshift-ovn-kubernetes-{BRANCH}-images/{job_id}/build-log.txt"
-        )
+        if long_layout:
+            for build_name, step in build_times.items():
+                build_data.append({
+                    "Job ID": job_id,
+                    "Build": build_name,
+                    "Status": step["status"],
+                    "Seconds": step["seconds"],
+                    "Job Result": result,
+                    "PR Number": pr_number,
+                    "Human Readable Date": human_readable_date,
+                    "Time of Day": time_of_day,
+                    "Job Name": job_name or JOB_TEMPLATE.format(branch=branch),
+                    "Branch": branch,
+                    "Start DateTime": start_datetime,
+                })
+            continue
 
-        # Fetch build times from the log
-        build_times = fetch_build_times(log_url)
-        build_src = build_times.get("src-amd64", None)
-        build_base = build_times.get("ovn-kubernetes-base-amd64", None)
-        build_microshift = build_times.get("ovn-kubernetes-microshift-amd64", None)
-        build_ovn = build_times.get("ovn-kubernetes-amd64", None)
+        build_src, build_base, build_microshift, build_ovn = (
+            build_times.get(target, None) for target in BUILD_TARGETS
+        )
 
         build_data.append({
             "Job ID": job_id,
@@ -112,41 +661,583 @@ def parse_build_data(builds):
             "Build ovn-kubernetes-base-amd64 (s)": build_base,
             "Build ovn-kubernetes-microshift-amd64 (s)": build_microshift,
             "Build ovn-kubernetes-amd64 (s)": build_ovn,
+            "Job Name": job_name or JOB_TEMPLATE.format(branch=branch),
+            "Branch": branch,
             "Start DateTime": start_datetime,  # For debugging or further processing
         })
     return build_data
 
 
-def main():
-    url = JOB_HISTORY_URL
-    all_data = []
+class ParquetBuildDataWriter:
+    """Stream rows into a month-partitioned Parquet dataset as pages finish.
+
+    Each month is one file, <root>/month=YYYY-MM/part-0.parquet, so readers
+    can prune by month via the Hive partition key. Every page is merged
+    into its month's file by Job ID, the new row replacing any old one,
+    and the file is replaced atomically, so a crash only loses the page in
+    flight and re-crawling runs that are already there never duplicates
+    them. Files left by older versions of this writer (one per page) are
+    folded into the month file the next time that month is written.
+    """
+
+    def __init__(self, root=OUTPUT_PARQUET_DIR):
+        import pyarrow as pa
+
+        self.root = root
+        self.rows_written = 0
+        self._lock = threading.Lock()
+        build_fields = [pa.field(f"Build {target} (s)", pa.int32()) for target in BUILD_TARGETS]
+        self.schema = pa.schema([
+            pa.field("Job ID", pa.string()),
+            pa.field("PR Number", pa.int64()),
+            pa.field("Duration (ns)", pa.int64()),
+            pa.field("Start DateTime", pa.timestamp("s", tz="UTC")),
+            pa.field("Spyglass Link", pa.string()),
+            pa.field("Log URL", pa.string()),
+            *build_fields,
+            pa.field("Job Name", pa.string()),
+            pa.field("Branch", pa.string()),
+        ])
+
+    def _month_files(self, partition):
+        if not os.path.isdir(partition):
+            return []
+        return sorted(os.path.join(partition, name) for name in os.listdir(partition)
+                      if name.endswith(".parquet") and not name.startswith((".", "_")))
+
+    def job_ids(self):
+        """Return the set of job IDs already in the dataset (for --incremental)."""
+        import pyarrow.parquet as pq
+
+        if not os.path.isdir(self.root):
+            return set()
+        job_ids = set()
+        for partition in os.listdir(self.root):
+            for path in self._month_files(os.path.join(self.root, partition)):
+                job_ids.update(pq.read_table(path, columns=["Job ID"]).column("Job ID").to_pylist())
+        return job_ids
+
+    def write_rows(self, rows):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        by_month = {}
+        for row in rows:
+            by_month.setdefault(row["Start DateTime"].strftime("%Y-%m"), []).append(row)
+
+        for month, month_rows in by_month.items():
+            columns = {}
+            for field in self.schema:
+                values = [row.get(field.name) for row in month_rows]
+                if field.name == "PR Number":
+                    values = [value if isinstance(value, int) else None for value in values]
+                columns[field.name] = values
+            table = pa.Table.from_pydict(columns, schema=self.schema)
+
+            partition = os.path.join(self.root, f"month={month}")
+            path = os.path.join(partition, "part-0.parquet")
+            tmp_path = os.path.join(partition, ".part-0.parquet.tmp")
+            with self._lock:
+                os.makedirs(partition, exist_ok=True)
+                old_files = self._month_files(partition)
+                tables = [table]
+                seen = table["Job ID"]
+                for old_path in old_files:
+                    old = pq.read_table(old_path).select(self.schema.names).cast(self.schema)
+                    old = old.filter(pc.invert(pc.is_in(old["Job ID"], value_set=seen)))
+                    tables.append(old)
+                    seen = pa.chunked_array(seen.chunks + old["Job ID"].chunks)
+                merged = pa.concat_tables(tables).sort_by("Start DateTime")
+                pq.write_table(merged, tmp_path)
+                os.replace(tmp_path, path)
+                for old_path in old_files:
+                    if old_path != path:
+                        os.remove(old_path)
+                self.rows_written += len(month_rows)
+
+
+class SqliteBuildDataWriter:
+    """Upsert rows into the shared SQLite build-history store as pages finish.
+
+    Accepts both wide rows (one per run, a column per BUILD_TARGETS entry)
+    and long rows (one per build step).
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.store = BuildStore(path)
+        self.rows_written = 0
+
+    def write_rows(self, rows):
+        builds = {}
+        steps = []
+        for row in rows:
+            job_id = row["Job ID"]
+            pr_number = row["PR Number"]
+            builds[job_id] = {
+                "job_id": job_id,
+                "job_name": row.get("Job Name"),
+                "branch": row.get("Branch"),
+                "pr_number": pr_number if isinstance(pr_number, int) else None,
+                "start_time": row["Start DateTime"].astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+                "duration_ns": row.get("Duration (ns)"),
+                "result": row.get("Job Result", "SUCCESS"),
+                "spyglass_link": row.get("Spyglass Link"),
+                "log_url": row.get("Log URL"),
+            }
+            if "Build" in row:
+                steps.append({"job_id": job_id, "build_name": row["Build"],
+                              "status": row["Status"], "seconds": row["Seconds"]})
+                continue
+            for target in BUILD_TARGETS:
+                seconds = row.get(f"Build {target} (s)")
+                if seconds is not None:
+                    steps.append({"job_id": job_id, "build_name": target,
+                                  "status": "succeeded", "seconds": seconds})
+        self.store.upsert(builds.values(), steps)
+        self.rows_written += len(rows)
+
+    def close(self):
+        self.store.close()
+
+
+class CrawlCheckpoint:
+    """Crawl cursors and finished rows, saved after every page.
+
+    The state file records, per job, the URL of the next page to fetch and
+    how many rows of the companion <path>.rows.jsonl file are committed.
+    It is rewritten atomically, so a crash or Ctrl-C at any point leaves a
+    consistent checkpoint; rows appended after the last state write are
+    truncated away by load() and that page is fetched again. With
+    `keep_rows=False` (streaming output) only the cursors are kept.
+    """
+
+    def __init__(self, path=DEFAULT_CHECKPOINT_PATH, job_specs=(), keep_rows=True):
+        self.path = path
+        self.rows_path = path + ".rows.jsonl"
+        self.keep_rows = keep_rows
+        self._lock = threading.Lock()
+        self.state = {
+            "jobs": [list(spec) for spec in job_specs],
+            "cursors": {},
+            "done": [],
+            "rows_committed": 0,
+        }
+
+    def load(self):
+        """Load a saved checkpoint; raise if it was made for a different job list."""
+        with open(self.path) as f:
+            saved = json.load(f)
+        if saved["jobs"] != self.state["jobs"]:
+            raise ValueError(f"{self.path} was saved for jobs {saved['jobs']}, not {self.state['jobs']}")
+        self.state = saved
+        self._truncate_uncommitted_rows()
+
+    def _truncate_uncommitted_rows(self):
+        """Cut the rows file back to its committed lines.
+
+        Otherwise rows written after the last state save would stay ahead
+        of the rows this run appends, and the next resume would read them
+        in place of the newest committed ones.
+        """
+        if not os.path.exists(self.rows_path):
+            return
+        with open(self.rows_path, "rb+") as f:
+            for _ in range(self.state["rows_committed"]):
+                if not f.readline():
+                    break
+            f.truncate(f.tell())
+
+    def start_url(self, job_name):
+        """Return the URL to resume `job_name` from, or None if it has no cursor."""
+        return self.state["cursors"].get(job_name)
 
-    while url:
-        print(f"Fetching page: {url}")
-        page_source = fetch_page(url)
+    def is_done(self, job_name):
+        return job_name in self.state["done"]
 
-        # Extract builds and older runs link
-        builds = extract_all_builds(page_source)
-        page_data = parse_build_data(builds)
+    def rows_for(self, job_name):
+        """Return the committed rows of `job_name`, in crawl order."""
+        if not self.keep_rows or not os.path.exists(self.rows_path):
+            return []
+        rows = []
+        with open(self.rows_path) as f:
+            for _, line in zip(range(self.state["rows_committed"]), f):
+                entry = json.loads(line)
+                if entry["job"] == job_name:
+                    row = entry["row"]
+                    row["Start DateTime"] = datetime.fromisoformat(row["Start DateTime"])
+                    rows.append(row)
+        return rows
+
+    def save_page(self, job_name, next_url, rows):
+        """Commit one finished page: its rows, then the cursor past it."""
+        with self._lock:
+            if self.keep_rows and rows:
+                with open(self.rows_path, "a") as f:
+                    for row in rows:
+                        f.write(json.dumps({"job": job_name, "row": row}, default=datetime.isoformat) + "\n")
+                self.state["rows_committed"] += len(rows)
+            self.state["cursors"][job_name] = next_url
+            self._write_state()
+
+    def mark_done(self, job_name):
+        with self._lock:
+            self.state["done"].append(job_name)
+            self._write_state()
+
+    def _write_state(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        for path in (self.path, self.rows_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+stop_crawl = threading.Event()
+
+
+def build_observations(rows):
+    """Yield (job name, build name, job ID, start time, seconds) from wide or long rows."""
+    for row in rows:
+        if "Build" in row:
+            if row["Status"] == "succeeded":
+                yield row["Job Name"], row["Build"], row["Job ID"], row["Start DateTime"], row["Seconds"]
+            continue
+        for target in BUILD_TARGETS:
+            seconds = row.get(f"Build {target} (s)")
+            if seconds is not None:
+                yield row["Job Name"], target, row["Job ID"], row["Start DateTime"], seconds
+
+
+def report_regressions(observations, state_path, alerts_path):
+    """Feed new build times to the online detector and record any alerts."""
+    monitor = RegressionMonitor.load(state_path)
+    alerts = monitor.feed(observations)
+    monitor.save(state_path)
+    if alerts:
+        append_alerts(alerts, alerts_path)
+    for alert in alerts:
+        print(f"REGRESSION: {alert['job_name']} {alert['build']} got {alert['direction']} at job {alert['job_id']} "
+              f"({alert['start_time']}): {alert['seconds']}s vs baseline "
+              f"{alert['baseline_mean']}s +/- {alert['baseline_std']}s")
+    print(f"Regression detector: {len(alerts)} alert(s), state saved to {state_path}")
+
+
+def update_rollups(observations, path):
+    """Add new build times to the percentile rollups stored at `path`."""
+    rollups = BuildRollups.load(path)
+    added = rollups.update(observations)
+    rollups.save(path)
+    print(f"Percentile rollups: added {added} build time(s) to {path}")
+
+
+def load_job_specs(args):
+    """Expand --job/--branch/--jobs-file into a list of (job name, branch) pairs."""
+    specs = []
+    for template in args.job or [JOB_TEMPLATE]:
+        for branch in args.branch or [BRANCH]:
+            specs.append((template.format(branch=branch), branch))
+    if args.jobs_file:
+        with open(args.jobs_file) as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                fields = line.split()
+                if len(fields) != 2:
+                    raise ValueError(f"Expected 'JOB_NAME BRANCH' in {args.jobs_file}: {line!r}")
+                specs.append((fields[0], fields[1]))
+    # Drop duplicates but keep the order the jobs were given in
+    return list(dict.fromkeys(specs))
+
+
+def crawl_job(job_name, branch, args, cache=None, known_job_ids=frozenset(), on_page=None,
+              checkpoint=None):
+    """Walk one job's history back to CUTOFF_DATE (or --from) and return its rows.
+
+    With --to, the crawl first seeks to the page holding that date rather
+    than paging back from the newest run. If `on_page` is given, each
+    page's rows are handed to it as soon as the page is done instead of
+    being collected and returned. With a `checkpoint`, progress is saved
+    after every page and a resumed crawl continues from the saved cursor.
+
+    In incremental mode the crawl goes --overlap-pages pages past the first
+    page holding a known job ID: a run still pending at the last crawl is
+    older than the newest run recorded then, so it can sit further back.
+    """
+    job_data = checkpoint.rows_for(job_name) if checkpoint is not None and on_page is None else []
+    if checkpoint is not None and checkpoint.is_done(job_name):
+        print(f"{job_name} already finished in checkpoint ({len(job_data)} rows)")
+        return job_data
+
+    start_url = job_history_url(job_name)
+    resume_url = checkpoint.start_url(job_name) if checkpoint is not None else None
+    if resume_url is not None:
+        start_url = resume_url
+        print(f"Resuming {job_name} at {start_url} with {len(job_data)} rows already collected")
+    elif args.until is not None:
+        cursor = seek_build_id(job_name, args.until)
+        if cursor is not None:
+            start_url = f"{start_url}?buildId={cursor}"
+            print(f"Seeked {job_name} to buildId {cursor} for runs before {args.until:%Y-%m-%d %H:%M}")
+
+    pages_past_known = None
+    for url, page_source, builds in iter_history_pages(start_url, args.prefetch_pages, args.since):
+        if stop_crawl.is_set():
+            return job_data
+        print(f"Fetched page: {url}")
+        new_builds = [build for build in builds if build.get("ID") not in known_job_ids]
+        page_data = parse_build_data(new_builds, workers=args.workers, cache=cache,
+                                     job_name=job_name, branch=branch, layout=args.layout,
+                                     fetch_strategy=args.fetch_strategy,
+                                     since=args.since, until=args.until)
 
         # Add valid builds to the master list
-        all_data.extend(page_data)
+        if on_page is not None:
+            if page_data:
+                on_page(page_data)
+        else:
+            job_data.extend(page_data)
+
+        if checkpoint is not None:
+            checkpoint.save_page(job_name, get_older_runs_link(page_source), page_data)
 
-        # Check if we should stop (based on dates)
-        if page_data and min(item["Start DateTime"] for item in page_data) < CUTOFF_DATE:
+        # Past the overlap, everything from here back is already in the output file
+        if pages_past_known is not None:
+            pages_past_known += 1
+        elif len(new_builds) < len(builds):
+            pages_past_known = 0
+        if pages_past_known is not None and pages_past_known >= args.overlap_pages:
             break
 
-        # Follow the "Older Runs" link
-        url = get_older_runs_link(page_source)
+    if checkpoint is not None:
+        checkpoint.mark_done(job_name)
+    return job_data
 
+
+def load_known_job_ids(csv_path):
+    """Return the set of job IDs already recorded in `csv_path`."""
+    if not os.path.exists(csv_path):
+        return set()
+    existing = pd.read_csv(csv_path, usecols=["Job ID"], dtype={"Job ID": str})
+    return set(existing["Job ID"])
+
+
+def save_csv(all_data, output, append=False):
     # Remove 'Start DateTime' from output before saving
     for item in all_data:
         del item["Start DateTime"]
 
     # Save data to a CSV
     df = pd.DataFrame(all_data)
-    df.to_csv("build_data.csv", index=False)
-    print("Data saved to build_data.csv")
+    if append:
+        if not df.empty:
+            # Match the existing file's columns, which may predate newer fields
+            header = pd.read_csv(output, nrows=0).columns
+            df.reindex(columns=header).to_csv(output, mode="a", header=False, index=False)
+        print(f"Appended {len(df)} new rows to {output}")
+    else:
+        df.to_csv(output, index=False)
+        print(f"Data saved to {output}")
+
+
+def parse_utc_datetime(value):
+    """Parse an ISO date/time for --from/--to; naive values are taken as UTC."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Collect image build times from Prow job history.")
+    parser.add_argument("--job", action="append",
+                        help=f"Prow job to crawl; '{{branch}}' is replaced by each --branch. "
+                             f"Repeatable (default: {JOB_TEMPLATE})")
+    parser.add_argument("--branch", action="append",
+                        help=f"Branch to crawl for each --job. Repeatable (default: {BRANCH})")
+    parser.add_argument("--jobs-file",
+                        help="File with one 'JOB_NAME BRANCH' pair per line, crawled in addition to --job")
+    parser.add_argument("--from", dest="since", type=parse_utc_datetime,
+                        help=f"Oldest start time to collect, ISO format, UTC (default: {CUTOFF_DATE:%Y-%m-%d})")
+    parser.add_argument("--to", dest="until", type=parse_utc_datetime,
+                        help="Collect only runs started before this time, seeking straight to it by buildId")
+    parser.add_argument("--parallel-jobs", type=int, default=DEFAULT_PARALLEL_JOBS,
+                        help=f"Jobs to crawl at the same time (default: {DEFAULT_PARALLEL_JOBS})")
+    parser.add_argument("--rate-limit", type=float, default=DEFAULT_RATE_LIMIT,
+                        help=f"Max requests per second across all jobs (default: {DEFAULT_RATE_LIMIT}, 0 = unlimited)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Build logs to fetch concurrently (default: {DEFAULT_WORKERS}, 1 = serial)")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST,
+                        help=f"Max in-flight requests per host (default: {DEFAULT_PER_HOST})")
+    parser.add_argument("--prefetch-pages", type=int, default=DEFAULT_PREFETCH_PAGES,
+                        help=f"Job-history pages to fetch ahead of log processing (default: {DEFAULT_PREFETCH_PAGES}, 0 = off)")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                        help=f"Retries for connection errors, timeouts and 429/5xx (default: {DEFAULT_RETRIES})")
+    parser.add_argument("--backoff", type=float, default=DEFAULT_BACKOFF,
+                        help=f"Base delay in seconds for jittered exponential backoff (default: {DEFAULT_BACKOFF})")
+    parser.add_argument("--connect-timeout", type=float, default=DEFAULT_CONNECT_TIMEOUT,
+                        help=f"Connect timeout in seconds (default: {DEFAULT_CONNECT_TIMEOUT})")
+    parser.add_argument("--read-timeout", type=float, default=DEFAULT_READ_TIMEOUT,
+                        help=f"Read timeout in seconds (default: {DEFAULT_READ_TIMEOUT})")
+    parser.add_argument("--format", choices=["csv", "parquet", "sqlite"], default="csv",
+                        help="csv writes one file at the end; parquet streams a month-partitioned dataset; "
+                             "sqlite upserts into the build-history store shared with analyzeBuildData.py "
+                             "(default: csv)")
+    parser.add_argument("--layout", choices=["wide", "long"], default="wide",
+                        help="wide: one row per job with the four image columns; "
+                             "long: one row per (job, build step), including failed steps (default: wide)")
+    parser.add_argument("--fetch-strategy", choices=sorted(FETCH_STRATEGIES), default="log",
+                        help="log: stream build-log.txt; artifacts: read the small ci-operator step-graph "
+                             "JSON first and fall back to the log only when needed. "
+                             "Applies to --layout wide (default: log)")
+    parser.add_argument("--output",
+                        help=f"Output CSV file, Parquet directory or SQLite store "
+                             f"(default: {OUTPUT_CSV}, {OUTPUT_STEPS_CSV} for --layout long, "
+                             f"{OUTPUT_PARQUET_DIR}, {DEFAULT_STORE_PATH})")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Stop at the first job already in the output file and append only newer rows")
+    parser.add_argument("--overlap-pages", type=int, default=DEFAULT_OVERLAP_PAGES,
+                        help=f"With --incremental, pages to read past the first known job, to pick up runs "
+                             f"that were still pending last time (default: {DEFAULT_OVERLAP_PAGES})")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT_PATH,
+                        help=f"State file saved after every page (default: {DEFAULT_CHECKPOINT_PATH})")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted crawl from --checkpoint instead of starting over")
+    parser.add_argument("--detect-regressions", action="store_true",
+                        help="Feed the new build times to the online change-point detector")
+    parser.add_argument("--regression-state", default=DEFAULT_STATE_PATH,
+                        help=f"Detector state carried between runs (default: {DEFAULT_STATE_PATH})")
+    parser.add_argument("--regression-alerts", default=DEFAULT_ALERTS_PATH,
+                        help=f"JSON Lines file that alerts are appended to (default: {DEFAULT_ALERTS_PATH})")
+    parser.add_argument("--update-rollups", action="store_true",
+                        help="Add the new build times to the p50/p90/p99 rollup sketches")
+    parser.add_argument("--rollups", default=DEFAULT_ROLLUPS_PATH,
+                        help=f"Rollup sketch file kept next to the data (default: {DEFAULT_ROLLUPS_PATH})")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH,
+                        help=f"SQLite file caching parsed build times by job ID (default: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always download build logs and leave the cache untouched")
+    parser.add_argument("--cache-max-age-days", type=int, default=DEFAULT_CACHE_MAX_AGE_DAYS,
+                        help=f"Evict cache entries older than this (default: {DEFAULT_CACHE_MAX_AGE_DAYS})")
+    parser.add_argument("--cache-max-entries", type=int, default=DEFAULT_CACHE_MAX_ENTRIES,
+                        help=f"Keep at most this many cache entries (default: {DEFAULT_CACHE_MAX_ENTRIES})")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.layout == "long" and args.format == "parquet":
+        raise SystemExit("--layout long is only supported with --format csv")
+    if args.output is None:
+        if args.format == "parquet":
+            args.output = OUTPUT_PARQUET_DIR
+        elif args.format == "sqlite":
+            args.output = DEFAULT_STORE_PATH
+        else:
+            args.output = OUTPUT_STEPS_CSV if args.layout == "long" else OUTPUT_CSV
+    if args.since is not None and args.until is not None and args.since >= args.until:
+        raise SystemExit("--from must be earlier than --to")
+    host_limiter.per_host = max(1, args.per_host)
+    rate_limiter.rate = args.rate_limit
+    http.retries = args.retries
+    http.backoff = args.backoff
+    http.timeout = (args.connect_timeout, args.read_timeout)
+    http.resize_pool(max(args.workers, args.per_host))
+    cache = None
+    if not args.no_cache:
+        # Full step lists, early-exit log times and step-graph times differ, so none may share entries
+        if args.layout == "long":
+            table = "build_steps"
+        elif args.fetch_strategy == "log":
+            table = "build_times"
+        else:
+            table = f"build_times_{args.fetch_strategy}"
+        cache = BuildTimesCache(args.cache, args.cache_max_age_days, args.cache_max_entries, table=table)
+
+    writer = None
+    if args.format == "parquet":
+        writer = ParquetBuildDataWriter(args.output)
+    elif args.format == "sqlite":
+        writer = SqliteBuildDataWriter(args.output)
+    on_page = writer.write_rows if writer is not None else None
+
+    # Streaming writers do not keep rows around, so collect build times as pages pass
+    collect_observations = args.detect_regressions or args.update_rollups
+    observations = []
+    if collect_observations and writer is not None:
+        def on_page(rows, write_rows=writer.write_rows):
+            write_rows(rows)
+            observations.extend(build_observations(rows))
+
+    known_job_ids = set()
+    if args.incremental:
+        if args.format == "sqlite":
+            known_job_ids = writer.store.job_ids()
+        elif args.format == "parquet":
+            known_job_ids = writer.job_ids()
+        else:
+            known_job_ids = load_known_job_ids(args.output)
+        print(f"Incremental mode: {len(known_job_ids)} jobs already in {args.output}")
+
+    job_specs = load_job_specs(args)
+    print(f"Crawling {len(job_specs)} job(s): " + ", ".join(job for job, _ in job_specs))
+
+    checkpoint = CrawlCheckpoint(args.checkpoint, job_specs, keep_rows=writer is None)
+    if args.resume:
+        if not os.path.exists(args.checkpoint):
+            raise SystemExit(f"--resume: no checkpoint at {args.checkpoint}")
+        checkpoint.load()
+    else:
+        checkpoint.remove()
+
+    # Crawl jobs side by side, but keep the output grouped in job order
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.parallel_jobs)) as executor:
+            futures = [
+                executor.submit(crawl_job, job_name, branch, args, cache, known_job_ids, on_page, checkpoint)
+                for job_name, branch in job_specs
+            ]
+            try:
+                all_data = [row for future in futures for row in future.result()]
+            except BaseException:
+                # Let the other crawls stop after their current page
+                stop_crawl.set()
+                raise
+    except KeyboardInterrupt:
+        print(f"\nInterrupted. Progress is saved in {args.checkpoint}; re-run with --resume to continue.")
+        sys.exit(130)
+    except Exception:
+        print(f"Crawl failed. Progress is saved in {args.checkpoint}; re-run with --resume to continue.")
+        raise
+
+    if writer is not None:
+        print(f"Wrote {writer.rows_written} rows to {args.output}")
+        if args.format == "sqlite":
+            writer.close()
+    else:
+        if collect_observations:
+            observations.extend(build_observations(all_data))
+        save_csv(all_data, args.output, append=bool(known_job_ids))
+    checkpoint.remove()
+
+    if args.detect_regressions:
+        report_regressions(observations, args.regression_state, args.regression_alerts)
+    if args.update_rollups:
+        update_rollups(observations, args.rollups)
+
+    stats = http.stats()
+    print(f"HTTP: {stats['requests']} requests, {stats['connections_opened']} connections opened, "
+          f"{stats['connections_reused']} reused, {stats['retries']} retries, "
+          f"{stats['bytes_read'] / 1e6:.1f} MB read")
+
+    if cache is not None:
+        print(f"Build times cache: {cache.hits} hits, {cache.misses} misses")
+        cache.close()
 
 
 if __name__ == "__main__":
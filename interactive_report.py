@@ -0,0 +1,318 @@
+"""Single-file interactive HTML report of build times.
+
+Each build column becomes a zoomable chart. The page embeds three things
+per series: an overview downsampled with Largest-Triangle-Three-Buckets
+(LTTB) to about `points` points, the daily median, and the full-resolution
+builds split into chunks of `points` builds. Chunks stay as unparsed JSON
+until a zoom window is narrow enough to need them, and the visible detail
+is run through LTTB again, so the browser never draws more than `points`
+points however many years of builds the file holds. No external scripts
+or styles are loaded.
+"""
+import html
+import json
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_HTML_POINTS = 2000
+# Zoom windows with up to this many builds per chart are drawn from the full-resolution chunks
+DETAIL_POINTS_FACTOR = 10
+
+
+def lttb(x, y, threshold):
+    """Return the indices of `threshold` points chosen by Largest-Triangle-Three-Buckets.
+
+    `x` must be sorted. The first and last points are always kept; every
+    bucket in between keeps the point forming the largest triangle with the
+    previously kept point and the average of the next bucket.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def series_payload(timestamps, values, points, series_index):
+    """Return (metadata, {chunk element id: chunk JSON}) for one build column.
+
+    `timestamps` are sorted epoch seconds. Chunk timestamps are
+    delta-encoded and values rounded to whole seconds to keep the file small.
+    """
+    keep = lttb(timestamps.astype(np.float64), values.astype(np.float64), points)
+    chunks, elements = [], {}
+    for start in range(0, len(timestamps), points):
+        element_id = f"chunk-{series_index}-{start // points}"
+        t = timestamps[start:start + points]
+        elements[element_id] = json.dumps({
+            "t0": int(t[0]),
+            "dt": np.diff(t, prepend=t[0]).tolist(),
+            "v": np.rint(values[start:start + points]).astype(np.int64).tolist(),
+        }, separators=(",", ":"))
+        chunks.append({"id": element_id, "start": int(t[0]), "end": int(t[-1]), "count": len(t)})
+
+    days = timestamps // 86400 * 86400
+    daily = pd.Series(values).groupby(days).median()
+    meta = {
+        "total": len(timestamps),
+        "overview": {"t": timestamps[keep].tolist(), "v": np.round(values[keep], 1).tolist()},
+        "daily": {"t": (daily.index + 43200).tolist(), "v": np.round(daily.to_numpy(), 1).tolist()},
+        "chunks": chunks,
+    }
+    return meta, elements
+
+
+def write_interactive_report(df, columns, path, points=DEFAULT_HTML_POINTS):
+    """Write one self-contained interactive HTML file with a chart per build column.
+
+    An empty `df` gives a page saying no builds matched, with no charts.
+    """
+    df = df.sort_values("Timestamp")
+    epoch_seconds = df["Timestamp"].astype("datetime64[s]").astype("int64").to_numpy()
+    series, elements = [], {}
+    for index, col in enumerate(columns if not df.empty else []):
+        has_value = df[col].notna().to_numpy()
+        if not has_value.any():
+            continue
+        meta, chunk_elements = series_payload(
+            epoch_seconds[has_value], df[col].to_numpy(dtype=np.float64)[has_value], points, index
+        )
+        meta["name"] = col
+        series.append(meta)
+        elements.update(chunk_elements)
+
+    config = {"points": points, "detailLimit": points * DETAIL_POINTS_FACTOR, "series": series}
+    chunk_scripts = "\n".join(
+        f'<script type="application/json" id="{element_id}">{data}</script>'
+        for element_id, data in elements.items()
+    )
+    if df.empty:
+        title = "Build times: no builds match the selected --from/--to/--pr range"
+    else:
+        title = f"Build times: {len(df)} builds, {df['Timestamp'].min():%Y-%m-%d} to {df['Timestamp'].max():%Y-%m-%d}"
+    with open(path, "w") as f:
+        f.write(PAGE_TEMPLATE
+                .replace("__TITLE__", html.escape(title))
+                .replace("__CONFIG__", json.dumps(config, separators=(",", ":")).replace("</", "<\\/"))
+                .replace("__CHUNKS__", chunk_scripts))
+    return path
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>__TITLE__</title>
+<style>
+body{font-family:sans-serif;margin:1em 2em}
+.chart{margin-bottom:2em}
+canvas{border:1px solid #ccc;cursor:crosshair}
+.status{color:#555;font-size:90%}
+</style></head><body>
+<h1>__TITLE__</h1>
+<p>Drag across a chart to zoom in, scroll to zoom around the pointer, double-click to reset.
+Blue: individual builds (downsampled to at most the configured points); orange: daily median.</p>
+<div id="charts"></div>
+<script type="application/json" id="config">__CONFIG__</script>
+__CHUNKS__
+<script>
+"use strict";
+const CONFIG = JSON.parse(document.getElementById("config").textContent);
+const chunkCache = {};
+
+function loadChunk(id) {
+  if (!(id in chunkCache)) {
+    const c = JSON.parse(document.getElementById(id).textContent);
+    const t = new Array(c.dt.length);
+    let acc = c.t0;
+    for (let i = 0; i < c.dt.length; i++) { acc += c.dt[i]; t[i] = acc; }
+    chunkCache[id] = {t: t, v: c.v};
+  }
+  return chunkCache[id];
+}
+
+function lttb(t, v, threshold) {
+  const n = t.length;
+  if (threshold >= n || threshold < 3) return {t: t, v: v};
+  const outT = [t[0]], outV = [v[0]];
+  const every = (n - 2) / (threshold - 2);
+  let a = 0;
+  for (let i = 0; i < threshold - 2; i++) {
+    const start = Math.floor(i * every) + 1, end = Math.floor((i + 1) * every) + 1;
+    const nextEnd = Math.min(Math.floor((i + 2) * every) + 1, n);
+    let avgT = 0, avgV = 0;
+    for (let j = end; j < nextEnd; j++) { avgT += t[j]; avgV += v[j]; }
+    const span = Math.max(nextEnd - end, 1);
+    avgT /= span; avgV /= span;
+    let best = start, bestArea = -1;
+    for (let j = start; j < end; j++) {
+      const area = Math.abs((t[a] - avgT) * (v[j] - v[a]) - (t[a] - t[j]) * (avgV - v[a]));
+      if (area > bestArea) { bestArea = area; best = j; }
+    }
+    outT.push(t[best]); outV.push(v[best]);
+    a = best;
+  }
+  outT.push(t[n - 1]); outV.push(v[n - 1]);
+  return {t: outT, v: outV};
+}
+
+function windowOf(data, x0, x1) {
+  const t = [], v = [];
+  for (let i = 0; i < data.t.length; i++) {
+    if (data.t[i] >= x0 && data.t[i] <= x1) { t.push(data.t[i]); v.push(data.v[i]); }
+  }
+  return {t: t, v: v};
+}
+
+function visiblePoints(series, x0, x1) {
+  const chunks = series.chunks.filter(c => c.end >= x0 && c.start <= x1);
+  const count = chunks.reduce((sum, c) => sum + c.count, 0);
+  if (count > CONFIG.detailLimit) {
+    return {points: windowOf(series.overview, x0, x1), detail: false};
+  }
+  const t = [], v = [];
+  for (const c of chunks) {
+    const data = loadChunk(c.id);
+    for (let i = 0; i < data.t.length; i++) {
+      if (data.t[i] >= x0 && data.t[i] <= x1) { t.push(data.t[i]); v.push(data.v[i]); }
+    }
+  }
+  return {points: lttb(t, v, CONFIG.points), detail: true, count: t.length};
+}
+
+function formatDate(seconds, withTime) {
+  const iso = new Date(seconds * 1000).toISOString();
+  return withTime ? iso.slice(0, 16).replace("T", " ") : iso.slice(0, 10);
+}
+
+class Chart {
+  constructor(series, parent) {
+    this.series = series;
+    const ts = series.overview.t;
+    this.extent = [ts[0], ts[ts.length - 1] + 1];
+    this.view = this.extent.slice();
+    const box = document.createElement("div");
+    box.className = "chart";
+    box.innerHTML = "<h2></h2><canvas width=\\"1100\\" height=\\"320\\"></canvas><div class=\\"status\\"></div>";
+    box.querySelector("h2").textContent = series.name;
+    parent.appendChild(box);
+    this.canvas = box.querySelector("canvas");
+    this.status = box.querySelector(".status");
+    this.ctx = this.canvas.getContext("2d");
+    this.margin = {left: 60, right: 10, top: 10, bottom: 30};
+    this.bindEvents();
+    this.draw();
+  }
+
+  xToTime(px) {
+    const w = this.canvas.width - this.margin.left - this.margin.right;
+    return this.view[0] + (px - this.margin.left) / w * (this.view[1] - this.view[0]);
+  }
+
+  setView(x0, x1) {
+    x0 = Math.max(x0, this.extent[0]);
+    x1 = Math.min(x1, this.extent[1]);
+    if (x1 - x0 < 60) return;
+    this.view = [x0, x1];
+    this.draw();
+  }
+
+  bindEvents() {
+    let dragFrom = null;
+    const offsetX = e => e.offsetX * this.canvas.width / this.canvas.clientWidth;
+    this.canvas.addEventListener("mousedown", e => { dragFrom = offsetX(e); });
+    this.canvas.addEventListener("mousemove", e => {
+      if (dragFrom === null) return;
+      this.draw();
+      this.ctx.fillStyle = "rgba(0, 0, 255, 0.1)";
+      this.ctx.fillRect(dragFrom, this.margin.top, offsetX(e) - dragFrom,
+                        this.canvas.height - this.margin.top - this.margin.bottom);
+    });
+    this.canvas.addEventListener("mouseup", e => {
+      const to = offsetX(e);
+      if (dragFrom !== null && Math.abs(to - dragFrom) > 3) {
+        const a = this.xToTime(Math.min(dragFrom, to)), b = this.xToTime(Math.max(dragFrom, to));
+        this.setView(a, b);
+      }
+      dragFrom = null;
+    });
+    this.canvas.addEventListener("dblclick", () => { this.view = this.extent.slice(); this.draw(); });
+    this.canvas.addEventListener("wheel", e => {
+      e.preventDefault();
+      const at = this.xToTime(offsetX(e));
+      const scale = e.deltaY > 0 ? 1.25 : 0.8;
+      this.setView(at - (at - this.view[0]) * scale, at + (this.view[1] - at) * scale);
+    }, {passive: false});
+  }
+
+  draw() {
+    const [x0, x1] = this.view;
+    const shown = visiblePoints(this.series, x0, x1);
+    const daily = windowOf(this.series.daily, x0, x1);
+    const pts = shown.points;
+    const values = pts.v.concat(daily.v);
+    let y0 = Math.min(...values), y1 = Math.max(...values);
+    if (!isFinite(y0)) { y0 = 0; y1 = 1; }
+    if (y1 === y0) { y1 = y0 + 1; }
+    const pad = (y1 - y0) * 0.05;
+    y0 -= pad; y1 += pad;
+
+    const ctx = this.ctx, m = this.margin;
+    const w = this.canvas.width - m.left - m.right, h = this.canvas.height - m.top - m.bottom;
+    const px = t => m.left + (t - x0) / (x1 - x0) * w;
+    const py = v => m.top + (1 - (v - y0) / (y1 - y0)) * h;
+    ctx.clearRect(0, 0, this.canvas.width, this.canvas.height);
+
+    ctx.strokeStyle = "#ddd"; ctx.fillStyle = "#333"; ctx.font = "11px sans-serif";
+    for (let i = 0; i <= 5; i++) {
+      const v = y0 + (y1 - y0) * i / 5, y = py(v);
+      ctx.beginPath(); ctx.moveTo(m.left, y); ctx.lineTo(m.left + w, y); ctx.stroke();
+      ctx.fillText(v.toFixed(0) + "s", 5, y + 4);
+    }
+    const withTime = x1 - x0 < 3 * 86400;
+    for (let i = 0; i <= 6; i++) {
+      const t = x0 + (x1 - x0) * i / 6;
+      ctx.fillText(formatDate(t, withTime), Math.min(px(t) - 30, m.left + w - 90), m.top + h + 18);
+    }
+
+    ctx.strokeStyle = "rgba(31, 119, 180, 0.6)"; ctx.fillStyle = "rgb(31, 119, 180)";
+    ctx.beginPath();
+    for (let i = 0; i < pts.t.length; i++) {
+      const x = px(pts.t[i]), y = py(pts.v[i]);
+      if (i === 0) ctx.moveTo(x, y); else ctx.lineTo(x, y);
+    }
+    ctx.stroke();
+    if (pts.t.length < 400) {
+      for (let i = 0; i < pts.t.length; i++) ctx.fillRect(px(pts.t[i]) - 2, py(pts.v[i]) - 2, 4, 4);
+    }
+
+    ctx.strokeStyle = "rgb(255, 127, 14)"; ctx.lineWidth = 2;
+    ctx.beginPath();
+    for (let i = 0; i < daily.t.length; i++) {
+      const x = px(daily.t[i]), y = py(daily.v[i]);
+      if (i === 0) ctx.moveTo(x, y); else ctx.lineTo(x, y);
+    }
+    ctx.stroke();
+    ctx.lineWidth = 1;
+
+    this.status.textContent = formatDate(x0, true) + " to " + formatDate(x1, true) + ": "
+      + (shown.detail
+         ? pts.t.length + " of " + shown.count + " builds in view (full resolution)"
+         : pts.t.length + " overview points (" + this.series.total + " builds in total; zoom in for full detail)");
+  }
+}
+
+const parent = document.getElementById("charts");
+for (const series of CONFIG.series) new Chart(series, parent);
+</script>
+</body></html>
+"""
@@ -0,0 +1,196 @@
+"""Pooled Jira REST client shared by bulk_clone.py and find_new_sprint_id.py.
+
+One keep-alive requests.Session carries every call, each with a connect
+and read timeout. Jira's rate-limit headers decide when to wait, and
+429 responses (and 503s to idempotent methods) are retried. Successful GETs are cached for a short TTL,
+paged endpoints are exposed as lazy generators, and per-method request
+counts and times are kept for reporting.
+"""
+import time
+from collections import OrderedDict
+
+import requests
+
+from counting_adapter import CountingHTTPAdapter
+
+DEFAULT_JIRA_URL = "https://issues.redhat.com"
+DEFAULT_TOKEN_PATH = "./jira_token"
+DEFAULT_TIMEOUT = (5, 30)
+DEFAULT_CACHE_TTL = 300
+DEFAULT_CACHE_ENTRIES = 256
+DEFAULT_PAGE_SIZE = 50
+MAX_RETRIES = 5
+RETRY_STATUSES = (429, 503)
+# A 503 can come back after Jira already acted on the request (e.g. a bulk create),
+# so other methods are only retried on 429, which Jira sends before doing anything
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+
+
+class JiraError(Exception):
+    """A Jira request that came back with an unexpected status."""
+
+    def __init__(self, response):
+        self.response = response
+        self.status_code = response.status_code
+        super().__init__(f"{response.request.method} {response.url} failed: "
+                         f"{response.status_code} - {response.text}")
+
+
+def load_token(path=DEFAULT_TOKEN_PATH):
+    with open(path, "r") as file:
+        return file.read().strip()
+
+
+class RateLimiter:
+    """Waits only when Jira says to, based on its rate-limit response headers.
+
+    A 429/503 is retried after its Retry-After. When X-RateLimit-Remaining
+    runs out, the next request waits for one token to refill
+    (X-RateLimit-Interval-Seconds / X-RateLimit-FillRate). Otherwise
+    requests go out back to back.
+    """
+
+    def __init__(self):
+        self.not_before = 0.0
+        self.slept = 0.0
+
+    def wait(self):
+        delay = self.not_before - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+            self.slept += delay
+
+    def observe(self, response):
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            self.not_before = time.monotonic() + float(retry_after)
+        elif response.headers.get("X-RateLimit-Remaining") == "0":
+            interval = float(response.headers.get("X-RateLimit-Interval-Seconds", 1))
+            fill_rate = float(response.headers.get("X-RateLimit-FillRate", 1))
+            self.not_before = time.monotonic() + interval / max(fill_rate, 1)
+
+
+class JiraClient:
+    """Keep-alive Jira session with rate limiting, GET caching and timing counters."""
+
+    def __init__(self, base_url=DEFAULT_JIRA_URL, token=None, timeout=DEFAULT_TIMEOUT,
+                 cache_ttl=DEFAULT_CACHE_TTL, cache_entries=DEFAULT_CACHE_ENTRIES):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.cache_entries = cache_entries
+        self.rate_limiter = RateLimiter()
+        self.session = requests.Session()
+        adapter = CountingHTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Content-Type"] = "application/json"
+        if token is not None:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        self._cache = OrderedDict()
+        self.counters = {"requests": 0, "retries": 0, "cache_hits": 0, "seconds": 0.0, "by_method": {}}
+
+    def url(self, path):
+        return path if path.startswith(("http://", "https://")) else f"{self.base_url}{path}"
+
+    def request(self, method, path, params=None, json=None, cache=True):
+        """Send one request and return the response, whatever its status.
+
+        Successful GETs are served from and stored in the cache unless
+        `cache` is False. 429/503 responses are retried as the rate limiter
+        directs; POST and other non-idempotent methods are only retried on
+        429.
+        """
+        url = self.url(path)
+        key = None
+        if method == "GET" and cache and self.cache_ttl > 0:
+            key = (url, tuple(sorted((params or {}).items())))
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                self.counters["cache_hits"] += 1
+                return cached[1]
+
+        retry_statuses = RETRY_STATUSES if method in IDEMPOTENT_METHODS else (429,)
+        for attempt in range(MAX_RETRIES + 1):
+            self.rate_limiter.wait()
+            started = time.perf_counter()
+            response = self.session.request(method, url, params=params, json=json, timeout=self.timeout)
+            self._count(method, time.perf_counter() - started)
+            self.rate_limiter.observe(response)
+            if response.status_code not in retry_statuses or attempt == MAX_RETRIES:
+                break
+            self.counters["retries"] += 1
+            if "Retry-After" not in response.headers:
+                self.rate_limiter.not_before = time.monotonic() + 2 ** attempt
+
+        if key is not None and response.status_code == 200:
+            self._cache[key] = (time.monotonic() + self.cache_ttl, response)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+        return response
+
+    def json(self, method, path, params=None, json=None, expect=(200, 201, 204), cache=True):
+        """Send a request and return its decoded body (None for 204), raising JiraError otherwise."""
+        response = self.request(method, path, params=params, json=json, cache=cache)
+        if response.status_code not in expect:
+            raise JiraError(response)
+        return response.json() if response.status_code != 204 and response.content else None
+
+    def get(self, path, params=None, cache=True):
+        return self.json("GET", path, params=params, cache=cache)
+
+    def post(self, path, json=None, expect=(200, 201, 204)):
+        return self.json("POST", path, json=json, expect=expect)
+
+    def paginate(self, path, values_key="values", params=None, json=None, method="GET",
+                 start_at=0, page_size=DEFAULT_PAGE_SIZE, cache=True):
+        """Yield items from a startAt/maxResults endpoint one page at a time.
+
+        Pages are requested only as the caller consumes them, so breaking
+        out of the loop stops paging. The last page is recognised by
+        `isLast` (agile API), `total` (search API) or an empty page. For
+        POST endpoints the paging fields go into the `json` body.
+        """
+        while True:
+            paging = {"startAt": start_at, "maxResults": page_size}
+            if method == "GET":
+                body = self.json("GET", path, params={**(params or {}), **paging}, cache=cache)
+            else:
+                body = self.json(method, path, json={**(json or {}), **paging})
+            values = body.get(values_key, [])
+            yield from values
+            start_at += len(values)
+            if not values or body.get("isLast", False) or start_at >= body.get("total", float("inf")):
+                return
+
+    def search(self, jql, fields, page_size=100):
+        """Yield every issue matching `jql` through POST /rest/api/2/search."""
+        return self.paginate("/rest/api/2/search", values_key="issues", method="POST",
+                             json={"jql": jql, "fields": fields}, page_size=page_size)
+
+    def invalidate(self):
+        self._cache.clear()
+
+    def _count(self, method, seconds):
+        self.counters["requests"] += 1
+        self.counters["seconds"] += seconds
+        by_method = self.counters["by_method"].setdefault(method, {"requests": 0, "seconds": 0.0})
+        by_method["requests"] += 1
+        by_method["seconds"] += seconds
+
+    def stats(self):
+        """Return the counters plus the number of TCP connections opened, reconnects included."""
+        adapters = {id(adapter): adapter for adapter in self.session.adapters.values()}
+        connections = sum(getattr(adapter, "connects", 0) for adapter in adapters.values())
+        return {**self.counters, "connections_opened": connections, "rate_limit_wait": self.rate_limiter.slept}
+
+    def summary(self):
+        stats = self.stats()
+        return (f"Jira: {stats['requests']} requests in {stats['seconds']:.2f}s over "
+                f"{stats['connections_opened']} connection(s), {stats['cache_hits']} cache hits, "
+                f"{stats['retries']} retries, {stats['rate_limit_wait']:.1f}s rate-limit wait")
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,263 @@
+"""Local stand-in for the parts of the Jira REST API these scripts use.
+
+Serves one agile board's sprint list, sprint lookups, sprint-add, issue
+get/create/bulk-create and a small subset of JQL search (`key in (...)`,
+`sprint in (...)` and `summary ~ "phrase"` joined by OR), all in memory.
+It speaks HTTP/1.1 keep-alive, can add per-request latency and enforce a
+requests-per-second limit with Jira's rate-limit headers, and counts
+requests and TCP connections so benchmarks can check connection reuse.
+
+    python3 jira_stand_in.py --port 8080 --sprints 600
+    python3 find_new_sprint_id.py --jira-url http://127.0.0.1:8080 "Sprint 590"
+
+Any bearer token is accepted.
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_BOARD_ID = "19143"
+DEFAULT_SPRINTS = 600
+FIRST_SPRINT_ID = 70000
+TEMPLATE_KEY = "CORENET-6030"
+
+
+class JiraState:
+    """In-memory board, sprints and issues behind the stand-in server."""
+
+    def __init__(self, board_id=DEFAULT_BOARD_ID, sprint_count=DEFAULT_SPRINTS):
+        self.board_id = board_id
+        self.sprints = [{"id": FIRST_SPRINT_ID + i, "name": f"Sprint {i}", "state": "closed"}
+                        for i in range(sprint_count)]
+        self.sprint_issues = {}
+        self.issues = {
+            TEMPLATE_KEY: {"key": TEMPLATE_KEY, "fields": {
+                "summary": "OVN-K CI check [GENERIC_TO_BE_CLONED]",
+                "description": "Look through the periodic jobs and file bugs.",
+                "customfield_12310243": 1,
+            }},
+        }
+        self.next_issue = 100000
+        self.lock = threading.Lock()
+
+    def sprint(self, sprint_id):
+        return next((s for s in self.sprints if str(s["id"]) == str(sprint_id)), None)
+
+    def create_issue(self, fields):
+        with self.lock:
+            self.next_issue += 1
+            key = f"{fields.get('project', {}).get('key', 'CORENET')}-{self.next_issue}"
+            self.issues[key] = {"key": key, "fields": dict(fields)}
+        return {"id": str(self.next_issue), "key": key, "self": f"/rest/api/2/issue/{key}"}
+
+    def search(self, jql):
+        """Evaluate the OR-joined JQL subset against the stored issues."""
+        keys = set()
+        for match in re.finditer(r"key in \(([^)]*)\)", jql):
+            keys.update(k.strip() for k in match.group(1).split(","))
+        sprint_ids = set()
+        for match in re.finditer(r"sprint in \(([^)]*)\)", jql):
+            sprint_ids.update(s.strip() for s in match.group(1).split(","))
+        phrases = [json.loads(m.group(0)) for m in re.finditer(r'"(?:[^"\\]|\\.)*"', jql)]
+        in_sprints = {key for sid in sprint_ids for key in self.sprint_issues.get(sid, [])}
+        return [
+            issue for key, issue in self.issues.items()
+            if key in keys or key in in_sprints
+            or any(phrase.lower() in issue["fields"].get("summary", "").lower() for phrase in phrases)
+        ]
+
+
+class JiraStandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this, keep-alive responses stall on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.stats["connections"] += 1
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, body=None, headers=None):
+        data = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def rate_limited(self):
+        """Apply the token bucket; return True if a 429 was sent."""
+        server = self.server
+        if not server.rate_limit:
+            return False
+        with server.stats_lock:
+            now = time.monotonic()
+            server.tokens = min(server.rate_limit, server.tokens + (now - server.refilled) * server.rate_limit)
+            server.refilled = now
+            if server.tokens < 1:
+                server.stats["throttled"] += 1
+                retry_after = (1 - server.tokens) / server.rate_limit
+                throttled = True
+            else:
+                server.tokens -= 1
+                remaining = int(server.tokens)
+                throttled = False
+        limit_headers = {"X-RateLimit-Limit": str(server.rate_limit),
+                         "X-RateLimit-Interval-Seconds": "1",
+                         "X-RateLimit-FillRate": str(server.rate_limit)}
+        if throttled:
+            self.read_json()
+            self.send_json(429, {"message": "Rate limit exceeded"},
+                           {**limit_headers, "Retry-After": f"{retry_after:.3f}", "X-RateLimit-Remaining": "0"})
+            return True
+        self.limit_headers = {**limit_headers, "X-RateLimit-Remaining": str(remaining)}
+        return False
+
+    def handle_request(self, method):
+        with self.server.stats_lock:
+            self.server.stats["requests"] += 1
+        self.limit_headers = {}
+        if self.rate_limited():
+            return
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        url = urlparse(self.path)
+        body = self.read_json() if method == "POST" else None
+        status, payload = self.route(method, url.path, parse_qs(url.query), body)
+        self.send_json(status, payload, self.limit_headers)
+
+    def route(self, method, path, query, body):
+        state = self.server.state
+        if method == "GET" and path == f"/rest/agile/1.0/board/{state.board_id}/sprint":
+            start_at = int(query.get("startAt", ["0"])[0])
+            max_results = min(int(query.get("maxResults", ["50"])[0]), 50)
+            values = state.sprints[start_at:start_at + max_results]
+            return 200, {"maxResults": max_results, "startAt": start_at,
+                         "isLast": start_at + max_results >= len(state.sprints), "values": values}
+        match = re.fullmatch(r"/rest/agile/1.0/sprint/(\d+)(/issue)?", path)
+        if match:
+            sprint = state.sprint(match.group(1))
+            if sprint is None:
+                return 404, {"errorMessages": [f"Sprint {match.group(1)} does not exist"]}
+            if match.group(2) and method == "POST":
+                with state.lock:
+                    state.sprint_issues.setdefault(str(sprint["id"]), []).extend(body.get("issues", []))
+                return 204, None
+            return 200, sprint
+        if method == "POST" and path == "/rest/api/2/issue/bulk":
+            return 201, {"issues": [state.create_issue(u["fields"]) for u in body["issueUpdates"]], "errors": []}
+        if method == "POST" and path == "/rest/api/2/issue":
+            return 201, state.create_issue(body["fields"])
+        if method == "POST" and path == "/rest/api/2/search":
+            issues = state.search(body.get("jql", ""))
+            start_at, max_results = body.get("startAt", 0), body.get("maxResults", 50)
+            fields = body.get("fields")
+            page = [
+                {"key": issue["key"],
+                 "fields": {k: v for k, v in issue["fields"].items() if not fields or k in fields}}
+                for issue in issues[start_at:start_at + max_results]
+            ]
+            return 200, {"startAt": start_at, "maxResults": max_results, "total": len(issues), "issues": page}
+        match = re.fullmatch(r"/rest/api/2/issue/([A-Z]+-\d+)", path)
+        if method == "GET" and match:
+            issue = state.issues.get(match.group(1))
+            if issue is None:
+                return 404, {"errorMessages": ["Issue Does Not Exist"]}
+            return 200, issue
+        return 404, {"errorMessages": [f"No stand-in route for {method} {path}"]}
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+
+class JiraStandIn:
+    """Run the stand-in server on a background thread.
+
+        with JiraStandIn(latency=0.02) as jira:
+            client = JiraClient(jira.url, token="test")
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, state=None, latency=0.0, rate_limit=0, verbose=False):
+        self.server = ThreadingHTTPServer((host, port), JiraStandInHandler)
+        self.server.daemon_threads = True
+        self.server.state = state or JiraState()
+        self.server.latency = latency
+        self.server.rate_limit = rate_limit
+        self.server.tokens = float(rate_limit)
+        self.server.refilled = time.monotonic()
+        self.server.verbose = verbose
+        self.server.stats = {"requests": 0, "connections": 0, "throttled": 0}
+        self.server.stats_lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def state(self):
+        return self.server.state
+
+    @property
+    def stats(self):
+        with self.server.stats_lock:
+            return dict(self.server.stats)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve an in-memory stand-in for the Jira REST API.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080)")
+    parser.add_argument("--sprints", type=int, default=DEFAULT_SPRINTS,
+                        help=f"Sprints on the board (default: {DEFAULT_SPRINTS})")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--rate-limit", type=float, default=0,
+                        help="Requests per second before answering 429 (default: unlimited)")
+    args = parser.parse_args()
+
+    stand_in = JiraStandIn(args.host, args.port, JiraState(sprint_count=args.sprints),
+                           args.latency, args.rate_limit, verbose=True)
+    print(f"Jira stand-in listening on {stand_in.url} (board {stand_in.state.board_id})")
+    try:
+        stand_in.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stand_in.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import sys
 from flask import Flask, jsonify, request, render_template
 from utils.script_fetcher import fetch_scripts
 from utils.gh_auth import check_gh_auth
+from utils.response_cache import ResponseCache
 from api.search import search_prs
 from api.jobs import get_pr_jobs
 from api.retest import retest_jobs
@@ -13,6 +14,30 @@ app = Flask(__name__)
 DEFAULT_QUERY = "is:pr is:open archived:false author:openshift-pr-manager[bot]"
 CLI_ARGS = []
 
+# Job status comes from two scripts making many gh calls, so reloads are served from memory.
+# Past its TTL an entry is still served for STALE_TTL seconds while it refreshes in the background.
+JOBS_CACHE_TTL = 60
+SEARCH_CACHE_TTL = 30
+STALE_TTL = 600
+CACHE_MAX_ENTRIES = 256
+JOBS_CACHE = ResponseCache(JOBS_CACHE_TTL, STALE_TTL, CACHE_MAX_ENTRIES)
+SEARCH_CACHE = ResponseCache(SEARCH_CACHE_TTL, STALE_TTL, CACHE_MAX_ENTRIES)
+
+
+def cached_json(cache, key, compute, fresh=False):
+    """
+    Serve `compute()` through `cache`, reporting hit/stale/miss in an X-Cache header.
+
+    With `fresh`, the cached entry is skipped and replaced ("bypass").
+    """
+    if fresh:
+        result, status = cache.refresh(key, compute), "bypass"
+    else:
+        result, status = cache.get(key, compute)
+    response = jsonify(result)
+    response.headers['X-Cache'] = status
+    return response
+
 
 @app.route('/')
 def index():
@@ -43,15 +68,14 @@ def api_search():
     page = data.get('page', 1)
     per_page = data.get('per_page', 10)
 
-    result = search_prs(query, page, per_page)
-    return jsonify(result)
+    return cached_json(SEARCH_CACHE, (query, page, per_page), lambda: search_prs(query, page, per_page))
 
 
 @app.route('/api/pr/<owner>/<repo>/<int:pr_number>')
 def api_pr_jobs(owner, repo, pr_number):
-    """Get job status for a PR."""
-    result = get_pr_jobs(owner, repo, pr_number)
-    return jsonify(result)
+    """Get job status for a PR; ?fresh=1 skips the cache (used while polling after a retest)."""
+    return cached_json(JOBS_CACHE, (owner, repo, str(pr_number)), lambda: get_pr_jobs(owner, repo, pr_number),
+                       fresh=request.args.get('fresh') == '1')
 
 
 @app.route('/api/retest', methods=['POST'])
@@ -69,6 +93,8 @@ def api_retest():
         return jsonify({"error": "Missing required fields"}), 400
 
     result = retest_jobs(owner, repo, pr, jobs, job_type)
+    # Retested jobs change state, so the next load must not show the cached status
+    JOBS_CACHE.invalidate((owner, repo, str(pr)))
     return jsonify(result)
 
 
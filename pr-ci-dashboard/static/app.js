@@ -204,7 +204,10 @@ function createJobSectionPlaceholder(type, owner, repo, number) {
 // ========================================
 async function loadPRJobs(owner, repo, number, cardElement) {
     try {
-        const response = await fetch(`/api/pr/${owner}/${repo}/${number}`);
+        // While polling after a retest, ask for live status rather than the server's cached copy
+        const prefix = `${owner}/${repo}/${number}/`;
+        const polling = [...retestedJobs.keys()].some(key => key.startsWith(prefix));
+        const response = await fetch(`/api/pr/${owner}/${repo}/${number}${polling ? '?fresh=1' : ''}`);
         const data = await response.json();
         updateCardWithJobs(cardElement, data, owner, repo, number);
     } catch (error) {
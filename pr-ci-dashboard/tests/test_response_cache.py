@@ -0,0 +1,128 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.response_cache import ResponseCache, is_cacheable
+
+
+class Counter:
+    """compute() stand-in that numbers its results and can be held open."""
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+        time.sleep(self.delay)
+        return {"e2e": {"call": call}}
+
+
+def test_is_cacheable_rejects_top_level_and_section_errors():
+    """Test that errors at the top level or inside a section are not cached"""
+    assert is_cacheable({"e2e": {"failed": []}, "payload": {"failed": []}})
+    assert not is_cacheable({"error": "gh failed"})
+    assert not is_cacheable({"e2e": {"error": "script failed"}, "payload": {"failed": []}})
+
+
+def test_hit_within_ttl_then_stale_refresh():
+    """Test that a fresh entry is a hit, and a stale one is served while refreshed in the background"""
+    cache = ResponseCache(ttl=0.1, stale_ttl=5, max_entries=8)
+    compute = Counter()
+
+    assert cache.get("pr", compute) == ({"e2e": {"call": 1}}, "miss")
+    assert cache.get("pr", compute) == ({"e2e": {"call": 1}}, "hit")
+    time.sleep(0.15)
+    assert cache.get("pr", compute) == ({"e2e": {"call": 1}}, "stale")
+    cache._refresher.shutdown(wait=True)
+
+    assert cache.get("pr", compute) == ({"e2e": {"call": 2}}, "hit")
+    assert cache.stats["refreshes"] == 1
+
+
+def test_expired_entry_is_recomputed_in_the_request():
+    """Test that an entry past ttl + stale_ttl is a miss"""
+    cache = ResponseCache(ttl=0.05, stale_ttl=0.05, max_entries=8)
+    compute = Counter()
+    cache.get("pr", compute)
+    time.sleep(0.15)
+
+    assert cache.get("pr", compute) == ({"e2e": {"call": 2}}, "miss")
+
+
+def test_concurrent_misses_share_one_computation():
+    """Test that requests arriving during a miss wait for it instead of recomputing"""
+    cache = ResponseCache(ttl=10, stale_ttl=10, max_entries=8)
+    compute = Counter(delay=0.2)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(cache.get("pr", compute))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert compute.calls == 1
+    assert sorted(status for _, status in results) == ["hit"] * 4 + ["miss"]
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that the oldest unused key goes once max_entries is exceeded"""
+    cache = ResponseCache(ttl=10, stale_ttl=10, max_entries=2)
+    compute = Counter()
+    cache.get("a", compute)
+    cache.get("b", compute)
+    cache.get("a", compute)
+    cache.get("c", compute)
+
+    assert cache.get("a", compute)[1] == "hit"
+    assert cache.get("b", compute)[1] == "miss"
+
+
+def test_errors_are_not_cached():
+    """Test that an error result is recomputed on the next request"""
+    cache = ResponseCache(ttl=10, stale_ttl=10, max_entries=8)
+
+    cache.get("pr", lambda: {"error": "gh failed"})
+
+    assert cache.get("pr", Counter())[1] == "miss"
+
+
+def test_invalidate_drops_result_computed_before_it():
+    """Test that a computation overtaken by invalidate() does not store its out-of-date result"""
+    cache = ResponseCache(ttl=10, stale_ttl=10, max_entries=8)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_compute():
+        started.set()
+        release.wait()
+        return {"e2e": {"before": "retest"}}
+
+    thread = threading.Thread(target=cache.get, args=("pr", slow_compute))
+    thread.start()
+    started.wait()
+    cache.invalidate("pr")
+    release.set()
+    thread.join()
+
+    assert cache.get("pr", Counter())[1] == "miss"
+
+
+def test_refresh_bypasses_and_replaces_the_entry():
+    """Test that refresh() always computes and later gets see its result"""
+    cache = ResponseCache(ttl=10, stale_ttl=10, max_entries=8)
+    compute = Counter()
+    cache.get("pr", compute)
+
+    assert cache.refresh("pr", compute) == {"e2e": {"call": 2}}
+    assert cache.refresh("pr", compute) == {"e2e": {"call": 3}}
+    assert cache.get("pr", compute) == ({"e2e": {"call": 3}}, "hit")
+    assert cache.stats["bypasses"] == 2
@@ -0,0 +1,127 @@
+"""In-process TTL + LRU cache with stale-while-revalidate refresh."""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable
+
+
+def is_cacheable(result: dict) -> bool:
+    """
+    Only successful results are cached; errors are retried on the next request.
+
+    Errors may be at the top level (search) or in a section such as
+    "e2e"/"payload" (job status).
+    """
+    if "error" in result:
+        return False
+    return not any(isinstance(value, dict) and "error" in value for value in result.values())
+
+
+class ResponseCache:
+    """
+    Cache for slow endpoint results.
+
+    Entries are fresh for `ttl` seconds. For a further `stale_ttl`
+    seconds they are still served straight away, while one background
+    refresh replaces them. Older entries, and misses, are computed in the
+    request. Concurrent misses for one key share a single computation.
+    Once `max_entries` is exceeded, the least recently used entry is
+    evicted.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, max_entries: int, refresh_workers: int = 4):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self._in_flight = {}  # key -> Event set when the computation finishes
+        self._generations = {}  # key -> bumped by invalidate() so in-flight results are dropped
+        self._refresher = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="cache-refresh")
+        self.stats = {"hits": 0, "stale": 0, "misses": 0, "refreshes": 0, "bypasses": 0}
+
+    def get(self, key: Hashable, compute: Callable[[], dict]) -> tuple:
+        """
+        Return the cached value for `key`, computing it if needed.
+
+        Returns:
+            (value, status) where status is "hit", "stale" or "miss"
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                age = time.monotonic() - entry[0] if entry else None
+                if entry and age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return entry[1], "hit"
+                if entry and age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stats["stale"] += 1
+                    if key not in self._in_flight:
+                        self._in_flight[key] = threading.Event()
+                        self._refresher.submit(self._compute, key, compute, True)
+                    return entry[1], "stale"
+                waiting_on = self._in_flight.get(key)
+                if waiting_on is None:
+                    self._in_flight[key] = threading.Event()
+                    self.stats["misses"] += 1
+                    break
+            # Someone else is computing this key; use their result once it lands
+            waiting_on.wait()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry and time.monotonic() - entry[0] < self.ttl:
+                    return entry[1], "hit"
+            # Their result was an error or already expired: compute it ourselves
+
+        return self._compute(key, compute), "miss"
+
+    def _compute(self, key: Hashable, compute: Callable[[], dict], background: bool = False) -> dict:
+        """Run `compute`, store a cacheable result and release anyone waiting on `key`."""
+        with self._lock:
+            generation = self._generations.get(key, 0)
+        try:
+            value = compute()
+            with self._lock:
+                if background:
+                    self.stats["refreshes"] += 1
+                self._store(key, value, generation)
+            return value
+        finally:
+            with self._lock:
+                event = self._in_flight.pop(key, None)
+            if event is not None:
+                event.set()
+
+    def _store(self, key: Hashable, value: dict, generation: int) -> None:
+        """Store a cacheable `value`; the caller holds the lock."""
+        # A result computed before an invalidate() may already be out of date
+        if is_cacheable(value) and self._generations.get(key, 0) == generation:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def refresh(self, key: Hashable, compute: Callable[[], dict]) -> dict:
+        """Compute `key` in the request, ignoring any cached entry, and store the result."""
+        with self._lock:
+            # Results already in flight started earlier, so they must not overwrite this one
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            self.stats["bypasses"] += 1
+        value = compute()
+        with self._lock:
+            self._store(key, value, generation)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop `key` so the next request recomputes it."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
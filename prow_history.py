@@ -0,0 +1,47 @@
+"""Parse Prow job-history pages.
+
+Run as a script to turn a job-history page on stdin into its `allBuilds`
+JSON array on stdout, e.g. for piping into jq from shell scripts.
+"""
+import json
+import sys
+
+ALL_BUILDS_MARKER = "var allBuilds ="
+
+_decoder = json.JSONDecoder()
+
+
+def extract_all_builds(page_source):
+    """Decode the `allBuilds` array embedded in a job-history page.
+
+    The array is decoded in place, starting right after the marker, so only
+    the array itself is scanned. Brackets or "];" inside strings cannot cut
+    it short.
+    """
+    start = page_source.find(ALL_BUILDS_MARKER)
+    if start == -1:
+        raise ValueError("Could not find allBuilds data in page source")
+    start += len(ALL_BUILDS_MARKER)
+    while page_source[start:start + 1].isspace():
+        start += 1
+    try:
+        builds, _ = _decoder.raw_decode(page_source, start)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Could not decode allBuilds data: {e}") from e
+    if not isinstance(builds, list):
+        raise ValueError("allBuilds is not a JSON array")
+    return builds
+
+
+def main():
+    try:
+        builds = extract_all_builds(sys.stdin.read())
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    json.dump(builds, sys.stdout)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Online detection of build-time regressions.
+
+Each (job, build target) pair keeps a Welford running mean/variance of its
+durations plus a two-sided CUSUM of the standardized deviations from that
+baseline, so runs of different jobs and branches never share a baseline.
+New observations from getBuildData.py are fed in start-time order; when
+either CUSUM crosses its threshold an alert record is emitted and the
+baseline restarts from the new level. The state, including the job IDs
+already fed, is saved as JSON between runs, so each crawl only has to look
+at the builds it just found and a re-crawled run is never counted twice.
+"""
+import json
+import math
+import os
+from datetime import datetime
+
+DEFAULT_STATE_PATH = "regression_state.json"
+DEFAULT_ALERTS_PATH = "regression_alerts.jsonl"
+# Classic CUSUM tuning: ignore drifts under half a standard deviation, alarm at 5
+DEFAULT_SLACK = 0.5
+DEFAULT_THRESHOLD = 5.0
+DEFAULT_WARMUP = 20
+
+
+class RunningStats:
+    """Welford's numerically stable running mean and variance."""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def to_dict(self):
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["count"], data["mean"], data["m2"])
+
+
+class ChangeDetector:
+    """Two-sided CUSUM change-point test for one build target."""
+
+    def __init__(self, slack=DEFAULT_SLACK, threshold=DEFAULT_THRESHOLD, warmup=DEFAULT_WARMUP):
+        self.slack = slack
+        self.threshold = threshold
+        self.warmup = warmup
+        self.stats = RunningStats()
+        self.cusum_up = 0.0
+        self.cusum_down = 0.0
+        self.seen_ids = set()
+
+    def update(self, value):
+        """Add one duration; return "slower" or "faster" if the level shifted, else None.
+
+        Until `warmup` values have been seen the baseline is only learned.
+        On a detection the baseline restarts from `value`, so one shift
+        raises one alert rather than one per later build.
+        """
+        if self.stats.count < self.warmup or self.stats.std == 0.0:
+            self.stats.add(value)
+            return None
+
+        z = (value - self.stats.mean) / self.stats.std
+        self.cusum_up = max(0.0, self.cusum_up + z - self.slack)
+        self.cusum_down = max(0.0, self.cusum_down - z - self.slack)
+        if self.cusum_up > self.threshold:
+            return "slower"
+        if self.cusum_down > self.threshold:
+            return "faster"
+        self.stats.add(value)
+        return None
+
+    def restart(self, value):
+        self.stats = RunningStats()
+        self.stats.add(value)
+        self.cusum_up = 0.0
+        self.cusum_down = 0.0
+
+    def to_dict(self):
+        return {
+            "stats": self.stats.to_dict(),
+            "cusum_up": self.cusum_up,
+            "cusum_down": self.cusum_down,
+            "seen_ids": sorted(self.seen_ids),
+        }
+
+    @classmethod
+    def from_dict(cls, data, **params):
+        detector = cls(**params)
+        detector.stats = RunningStats.from_dict(data["stats"])
+        detector.cusum_up = data["cusum_up"]
+        detector.cusum_down = data["cusum_down"]
+        detector.seen_ids = set(data["seen_ids"])
+        return detector
+
+
+class RegressionMonitor:
+    """Change detectors keyed by (job name, build target), with JSON persistence."""
+
+    def __init__(self, slack=DEFAULT_SLACK, threshold=DEFAULT_THRESHOLD, warmup=DEFAULT_WARMUP):
+        self.params = {"slack": slack, "threshold": threshold, "warmup": warmup}
+        self.detectors = {}  # (job name, target) -> ChangeDetector
+
+    @classmethod
+    def load(cls, path=DEFAULT_STATE_PATH, **params):
+        monitor = cls(**params)
+        if os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+            if "jobs" not in saved:
+                # Older state mixed every job into one baseline per target; relearn from scratch
+                print(f"{path} predates per-job baselines; starting the detector over")
+                return monitor
+            monitor.detectors = {
+                (job_name, target): ChangeDetector.from_dict(data, **monitor.params)
+                for job_name, targets in saved["jobs"].items()
+                for target, data in targets.items()
+            }
+        return monitor
+
+    def save(self, path=DEFAULT_STATE_PATH):
+        jobs = {}
+        for (job_name, target), detector in self.detectors.items():
+            jobs.setdefault(job_name, {})[target] = detector.to_dict()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"jobs": jobs}, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def feed(self, observations):
+        """Process (job name, target, job ID, start time, seconds) tuples; return alert records.
+
+        Observations are sorted by start time first. A job ID already fed
+        to its detector is skipped, so re-feeding rows from an overlapping
+        crawl is harmless, while a run that finished after newer ones
+        (pending at the last crawl) is still counted when it turns up.
+        """
+        alerts = []
+        for job_name, target, job_id, start, seconds in sorted(observations, key=lambda obs: obs[3]):
+            if seconds is None or (isinstance(seconds, float) and math.isnan(seconds)):
+                continue
+            detector = self.detectors.setdefault((job_name, target), ChangeDetector(**self.params))
+            if job_id in detector.seen_ids:
+                continue
+            detector.seen_ids.add(job_id)
+            start_text = start.isoformat() if isinstance(start, datetime) else str(start)
+
+            baseline_mean, baseline_std = detector.stats.mean, detector.stats.std
+            samples = detector.stats.count
+            direction = detector.update(seconds)
+            if direction is None:
+                continue
+            alerts.append({
+                "job_name": job_name,
+                "build": target,
+                "direction": direction,
+                "job_id": job_id,
+                "start_time": start_text,
+                "seconds": seconds,
+                "baseline_mean": round(baseline_mean, 1),
+                "baseline_std": round(baseline_std, 1),
+                "baseline_samples": samples,
+                "cusum": round(max(detector.cusum_up, detector.cusum_down), 2),
+            })
+            detector.restart(seconds)
+        return alerts
+
+
+def append_alerts(alerts, path=DEFAULT_ALERTS_PATH):
+    with open(path, "a") as f:
+        for alert in alerts:
+            f.write(json.dumps(alert) + "\n")
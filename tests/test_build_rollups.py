@@ -0,0 +1,120 @@
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from build_rollups import BuildRollups, QuantileSketch
+
+START = datetime(2024, 6, 3, tzinfo=timezone.utc)  # a Monday
+
+
+def durations(count, seed=0):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(7, 0.6) for _ in range(count)]
+
+
+@pytest.mark.parametrize("q", [0.5, 0.9, 0.99])
+def test_quantile_within_relative_accuracy(q):
+    """Test that quantiles stay within relative_accuracy of the exact order statistic"""
+    values = durations(5000)
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    exact = np.quantile(values, q, method="lower")
+    assert abs(sketch.quantile(q) - exact) <= 0.01 * exact
+
+
+def test_merge_equals_adding_everything_to_one_sketch():
+    """Test that merging two sketches gives the same bins as one sketch fed all values"""
+    left, right, combined = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for value in durations(1000):
+        left.add(value)
+        combined.add(value)
+    for value in durations(1000, seed=1) + [0]:
+        right.add(value)
+        combined.add(value)
+
+    merged = left.merge(right)
+
+    assert merged.to_dict() == combined.to_dict()
+
+
+def test_merge_rejects_different_accuracy():
+    """Test that sketches with different bucket widths are not merged"""
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+
+def test_empty_sketch_has_no_quantile():
+    """Test that an empty sketch returns None"""
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_rollups_update_skips_seen_builds_and_round_trips(tmp_path):
+    """Test that re-fed builds are not counted twice and saved rollups reload unchanged"""
+    path = str(tmp_path / "build_rollups.json")
+    observations = [("job-a", "build-a", str(i), START + timedelta(hours=i), value)
+                    for i, value in enumerate(durations(100))]
+    rollups = BuildRollups()
+
+    assert rollups.update(observations[:60]) == 60
+    assert rollups.update(observations) == 40
+    rollups.save(path)
+    reloaded = BuildRollups.load(path)
+
+    assert reloaded.merged("build-a", "day").count == 100
+    assert reloaded.percentiles("build-a", "hour") == rollups.percentiles("build-a", "hour")
+    assert sorted(reloaded.percentiles("build-a", "day", first_day="2024-06-05")) == \
+        ["2024-06-05", "2024-06-06", "2024-06-07"]
+    assert set(reloaded.sketches[("job-a", "build-a")]["weekday"]) == \
+        {"Monday", "Tuesday", "Wednesday", "Thursday", "Friday"}
+
+
+def test_run_finishing_after_newer_runs_is_still_added():
+    """Test that a run pending at one crawl is added at the next even though newer runs were seen"""
+    observations = [("job-a", "build-a", str(i), START + timedelta(hours=i), value)
+                    for i, value in enumerate(durations(30))]
+    pending = observations.pop(20)
+    rollups = BuildRollups()
+    rollups.update(observations)
+
+    assert rollups.update(observations + [pending]) == 1
+    assert rollups.merged("build-a", "day").count == 30
+
+
+def test_jobs_are_kept_apart_and_merged_on_read():
+    """Test that each job has its own sketches, and percentiles combine them unless one job is picked"""
+    rollups = BuildRollups()
+    rollups.update([("master", "build-a", "1", START, 100.0), ("release-4.16", "build-a", "1", START, 400.0)])
+
+    assert rollups.merged("build-a", "day").count == 2
+    assert rollups.merged("build-a", "day", job_name="master").count == 1
+    assert rollups.percentiles("build-a", "hour", percentiles=(1.0,), job_name="release-4.16")["0"][0] == \
+        pytest.approx(400, rel=0.01)
+
+
+def test_naive_and_aware_starts_land_in_the_same_buckets():
+    """Test that a naive start (taken as UTC) and the same instant with an offset share keys"""
+    rollups = BuildRollups()
+    rollups.update([
+        ("job-a", "build-a", None, datetime(2024, 6, 3, 23, 30), 100.0),
+        ("job-a", "build-a", None, datetime(2024, 6, 4, 1, 30, tzinfo=timezone(timedelta(hours=2))), 100.0),
+        ("job-a", "build-a", None, "2024-06-03T23:30:00+00:00", 100.0),
+    ])
+
+    assert {key: sketch.count for key, sketch in rollups.sketches[("job-a", "build-a")]["hour"].items()} == {"23": 3}
+    assert list(rollups.sketches[("job-a", "build-a")]["day"]) == ["2024-06-03"]
+
+
+def test_old_rollups_without_jobs_start_over(tmp_path):
+    """Test that a file from before per-job rollups is discarded rather than misread"""
+    path = tmp_path / "build_rollups.json"
+    path.write_text('{"relative_accuracy": 0.01, "high_water": {}, "sketches": {"build-a": {}}}')
+
+    assert BuildRollups.load(str(path)).sketches == {}
@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jira_stand_in import FIRST_SPRINT_ID, JiraStandIn
+
+BULK_CLONE = os.path.join(os.path.dirname(__file__), '..', 'bulk_clone.py')
+CLONES_PER_SPRINT = 6
+
+
+@pytest.fixture
+def workdir(tmp_path):
+    (tmp_path / 'jira_token').write_text('test\n')
+    return tmp_path
+
+
+def run_bulk_clone(workdir, jira_url, *sprint_ids):
+    result = subprocess.run([sys.executable, BULK_CLONE, *sprint_ids, '--jira-url', jira_url],
+                            cwd=workdir, capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+    return result.stdout
+
+
+def test_second_run_creates_nothing(workdir):
+    """Test that re-running the same plan skips every clone made by the first run"""
+    sprint_ids = [str(FIRST_SPRINT_ID + 1), str(FIRST_SPRINT_ID + 2)]
+    with JiraStandIn() as stand_in:
+        first = run_bulk_clone(workdir, stand_in.url, *sprint_ids)
+        issues_after_first = len(stand_in.state.issues)
+
+        second = run_bulk_clone(workdir, stand_in.url, *sprint_ids)
+
+        wanted = CLONES_PER_SPRINT * len(sprint_ids)
+        assert f"{wanted} of {wanted} clones to create" in first
+        assert issues_after_first == 1 + wanted
+        assert f"0 of {wanted} clones to create" in second
+        assert len(stand_in.state.issues) == issues_after_first
+        for sprint_id in sprint_ids:
+            assert len(stand_in.state.sprint_issues[sprint_id]) == CLONES_PER_SPRINT
+
+
+def test_new_sprint_only_gets_its_own_clones(workdir):
+    """Test that adding a sprint to an earlier run creates clones for that sprint only"""
+    first_sprint, new_sprint = str(FIRST_SPRINT_ID + 1), str(FIRST_SPRINT_ID + 2)
+    with JiraStandIn() as stand_in:
+        run_bulk_clone(workdir, stand_in.url, first_sprint)
+
+        second = run_bulk_clone(workdir, stand_in.url, first_sprint, new_sprint)
+
+        assert f"{CLONES_PER_SPRINT} of {2 * CLONES_PER_SPRINT} clones to create" in second
+        assert len(stand_in.state.sprint_issues[first_sprint]) == CLONES_PER_SPRINT
+        assert len(stand_in.state.sprint_issues[new_sprint]) == CLONES_PER_SPRINT
@@ -0,0 +1,77 @@
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from getBuildData import CrawlCheckpoint
+
+JOBS = [("job-a", "master")]
+
+
+def make_row(job_id):
+    return {"Job ID": str(job_id), "Start DateTime": datetime(2024, 6, 1, tzinfo=timezone.utc)}
+
+
+@pytest.fixture
+def checkpoint_path(tmp_path):
+    return str(tmp_path / "crawl.checkpoint.json")
+
+
+def test_rows_and_cursor_round_trip(checkpoint_path):
+    """Test that committed rows and cursors survive a reload"""
+    checkpoint = CrawlCheckpoint(checkpoint_path, JOBS)
+    checkpoint.save_page("job-a", "https://prow/page2", [make_row(1), make_row(2)])
+
+    resumed = CrawlCheckpoint(checkpoint_path, JOBS)
+    resumed.load()
+
+    assert resumed.start_url("job-a") == "https://prow/page2"
+    rows = resumed.rows_for("job-a")
+    assert [row["Job ID"] for row in rows] == ["1", "2"]
+    assert rows[0]["Start DateTime"] == datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def test_load_rejects_different_job_list(checkpoint_path):
+    """Test that a checkpoint is not resumed for another set of jobs"""
+    CrawlCheckpoint(checkpoint_path, JOBS).save_page("job-a", None, [make_row(1)])
+
+    with pytest.raises(ValueError):
+        CrawlCheckpoint(checkpoint_path, [("job-b", "master")]).load()
+
+
+def test_uncommitted_rows_are_dropped_across_repeated_resumes(checkpoint_path):
+    """Test that rows written after the last state save never resurface"""
+    checkpoint = CrawlCheckpoint(checkpoint_path, JOBS)
+    checkpoint.save_page("job-a", "https://prow/page2", [make_row(1), make_row(2)])
+    # A crash between appending a page's rows and saving the state
+    with open(checkpoint.rows_path, "a") as f:
+        for job_id in (90, 91):
+            f.write(json.dumps({"job": "job-a", "row": {"Job ID": str(job_id),
+                                                        "Start DateTime": "2024-06-01T00:00:00+00:00"}}) + "\n")
+        f.write('{"job": "job-a", "ro')
+
+    first_resume = CrawlCheckpoint(checkpoint_path, JOBS)
+    first_resume.load()
+    first_resume.save_page("job-a", "https://prow/page3", [make_row(3)])
+
+    second_resume = CrawlCheckpoint(checkpoint_path, JOBS)
+    second_resume.load()
+
+    assert [row["Job ID"] for row in second_resume.rows_for("job-a")] == ["1", "2", "3"]
+    with open(second_resume.rows_path) as f:
+        assert len(f.readlines()) == 3
+
+
+def test_streaming_checkpoint_keeps_no_rows(checkpoint_path):
+    """Test that keep_rows=False records cursors only"""
+    checkpoint = CrawlCheckpoint(checkpoint_path, JOBS, keep_rows=False)
+    checkpoint.save_page("job-a", "https://prow/page2", [make_row(1)])
+    checkpoint.mark_done("job-a")
+
+    assert not os.path.exists(checkpoint.rows_path)
+    assert checkpoint.rows_for("job-a") == []
+    assert checkpoint.is_done("job-a")
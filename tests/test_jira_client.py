@@ -0,0 +1,160 @@
+import os
+import sys
+import time
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jira_client import JiraClient
+from jira_stand_in import DEFAULT_BOARD_ID, FIRST_SPRINT_ID, JiraStandIn, JiraStandInHandler, JiraState
+
+SPRINTS_PATH = f"/rest/agile/1.0/board/{DEFAULT_BOARD_ID}/sprint"
+
+
+def sprint_path(offset):
+    return f"/rest/agile/1.0/sprint/{FIRST_SPRINT_ID + offset}"
+
+
+@pytest.fixture
+def stand_in():
+    with JiraStandIn(state=JiraState(sprint_count=120)) as jira:
+        yield jira
+
+
+def test_paginate_stops_on_is_last(stand_in):
+    """Test that paging ends with the page flagged isLast"""
+    client = JiraClient(stand_in.url, token="test")
+
+    sprints = list(client.paginate(SPRINTS_PATH, page_size=50, cache=False))
+
+    assert [s["id"] for s in sprints] == [FIRST_SPRINT_ID + i for i in range(120)]
+    assert stand_in.stats["requests"] == 3
+
+
+def test_paginate_stops_on_total(stand_in):
+    """Test that search paging ends once `total` issues were read, without an extra empty page"""
+    for number in range(4):
+        stand_in.state.create_issue({"summary": f"periodic check {number}"})
+    client = JiraClient(stand_in.url, token="test")
+
+    issues = list(client.search('summary ~ "check"', ["summary"], page_size=5))
+
+    assert len(issues) == 5
+    assert stand_in.stats["requests"] == 1
+
+
+def test_paginate_stops_on_empty_page(stand_in, monkeypatch):
+    """Test that paging ends on an empty page when neither isLast nor total is sent"""
+    route = JiraStandInHandler.route
+
+    def route_without_is_last(self, *args):
+        status, payload = route(self, *args)
+        payload.pop("isLast", None)
+        return status, payload
+
+    monkeypatch.setattr(JiraStandInHandler, "route", route_without_is_last)
+    stand_in.state.sprints = stand_in.state.sprints[:100]
+    client = JiraClient(stand_in.url, token="test")
+
+    sprints = list(client.paginate(SPRINTS_PATH, page_size=50, cache=False))
+
+    assert len(sprints) == 100
+    assert stand_in.stats["requests"] == 3
+
+
+def test_paginate_is_lazy(stand_in):
+    """Test that breaking out of the loop stops further page requests"""
+    client = JiraClient(stand_in.url, token="test")
+
+    for sprint in client.paginate(SPRINTS_PATH, page_size=50, cache=False):
+        if sprint["id"] == FIRST_SPRINT_ID + 10:
+            break
+
+    assert stand_in.stats["requests"] == 1
+
+
+def test_get_cache_expires_after_ttl(stand_in):
+    """Test that a cached GET is reused until its TTL runs out"""
+    client = JiraClient(stand_in.url, token="test", cache_ttl=0.2)
+
+    client.get(sprint_path(0))
+    client.get(sprint_path(0))
+    assert stand_in.stats["requests"] == 1
+    assert client.counters["cache_hits"] == 1
+
+    time.sleep(0.3)
+    client.get(sprint_path(0))
+    assert stand_in.stats["requests"] == 2
+
+
+def test_get_cache_evicts_least_recently_used(stand_in):
+    """Test that the cache drops the least recently used entry once full"""
+    client = JiraClient(stand_in.url, token="test", cache_entries=2)
+
+    client.get(sprint_path(0))
+    client.get(sprint_path(1))
+    client.get(sprint_path(0))  # hit; sprint 1 is now the oldest
+    client.get(sprint_path(2))  # evicts sprint 1
+    assert stand_in.stats["requests"] == 3
+
+    client.get(sprint_path(0))
+    assert stand_in.stats["requests"] == 3
+    client.get(sprint_path(1))
+    assert stand_in.stats["requests"] == 4
+
+
+def test_rate_limited_request_is_retried_after_retry_after():
+    """Test that a 429 is retried once the server's Retry-After has passed"""
+    with JiraStandIn(rate_limit=2) as stand_in:
+        # Use up the bucket from outside the client so its next request is throttled
+        for _ in range(2):
+            requests.get(f"{stand_in.url}{sprint_path(0)}")
+        client = JiraClient(stand_in.url, token="test")
+
+        sprint = client.get(sprint_path(1))
+
+        assert sprint["id"] == FIRST_SPRINT_ID + 1
+        assert stand_in.stats["throttled"] == 1
+        assert client.counters["retries"] == 1
+        assert client.rate_limiter.slept > 0
+
+
+@pytest.mark.parametrize("method,path,body,expected_requests", [
+    ("GET", sprint_path(0), None, 2),
+    ("POST", "/rest/api/2/issue", {"fields": {"summary": "clone"}}, 1),
+])
+def test_503_is_retried_only_for_idempotent_methods(stand_in, monkeypatch, method, path, body,
+                                                     expected_requests):
+    """Test that a 503 is retried for GET but not for a POST that may already have created issues"""
+    route = JiraStandInHandler.route
+    failed = []
+
+    def route_failing_once(self, *args):
+        # The request is carried out before the 503, as when Jira fails after creating issues
+        status, payload = route(self, *args)
+        if not failed:
+            failed.append(True)
+            return 503, {"message": "Service unavailable"}
+        return status, payload
+
+    monkeypatch.setattr(JiraStandInHandler, "route", route_failing_once)
+    client = JiraClient(stand_in.url, token="test")
+
+    response = client.request(method, path, json=body)
+
+    assert stand_in.stats["requests"] == expected_requests
+    assert response.status_code == (200 if method == "GET" else 503)
+
+
+def test_connections_opened_counts_reconnects(stand_in):
+    """Test that connections re-opened after an abandoned response are counted like the server sees them"""
+    client = JiraClient(stand_in.url, token="test")
+    for offset in range(3):
+        # A response closed before its body was read cannot go back to the pool
+        client.session.get(f"{stand_in.url}{sprint_path(offset)}", stream=True).close()
+    client.get(sprint_path(3))
+    client.get(sprint_path(4))
+
+    assert client.stats()["connections_opened"] == stand_in.stats["connections"] == 4
@@ -0,0 +1,56 @@
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from getBuildData import ParquetBuildDataWriter
+
+
+def make_rows(count):
+    start = datetime(2024, 5, 20, tzinfo=timezone.utc)
+    return [{"Job ID": str(1000 + i), "PR Number": i, "Duration (ns)": 1,
+             "Start DateTime": start + timedelta(days=i), "Build src-amd64 (s)": i,
+             "Job Name": "job-a", "Branch": "master"} for i in range(count)]
+
+
+def write_pages(root, rows, boundaries):
+    writer = ParquetBuildDataWriter(root)
+    for first, last in boundaries:
+        writer.write_rows([dict(row) for row in rows[first:last]])
+    return writer
+
+
+def test_rerun_with_shifted_pages_does_not_duplicate_rows(tmp_path):
+    """Test that a second crawl over the same runs, paged differently, upserts by Job ID"""
+    root = str(tmp_path / "build_data_parquet")
+    rows = make_rows(30)
+    write_pages(root, rows, [(0, 10), (10, 20)])
+
+    writer = write_pages(root, rows, [(5, 15), (15, 25), (25, 30)])
+
+    df = pd.read_parquet(root)
+    assert len(df) == 30
+    assert df["Job ID"].is_unique
+    assert writer.job_ids() == {row["Job ID"] for row in rows}
+    assert sorted(os.listdir(root)) == ["month=2024-05", "month=2024-06"]
+    assert os.listdir(os.path.join(root, "month=2024-06")) == ["part-0.parquet"]
+
+
+def test_newer_row_replaces_older_one(tmp_path):
+    """Test that re-writing a job keeps only its latest values"""
+    root = str(tmp_path / "build_data_parquet")
+    rows = make_rows(3)
+    write_pages(root, rows, [(0, 3)])
+    rows[1]["Build src-amd64 (s)"] = 99
+
+    write_pages(root, rows, [(1, 2)])
+
+    df = pd.read_parquet(root).set_index("Job ID")
+    assert len(df) == 3
+    assert df.loc["1001", "Build src-amd64 (s)"] == 99
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import linregress
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from analyzeBuildData import ordinal_days, regress_columns
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(738000, 738400, 500))
+    Y = np.column_stack([
+        2.0 * x + rng.normal(0, 300, x.size),
+        -0.5 * x + rng.normal(0, 50, x.size),
+        rng.normal(1000, 20, x.size),
+    ])
+    Y[rng.random(Y.shape) < 0.2] = np.nan
+    return x, Y
+
+
+def test_matches_linregress_per_column(samples):
+    """Test that every column's fit matches scipy's linregress on its non-NaN rows"""
+    x, Y = samples
+
+    slope, intercept, r, p_value = regress_columns(x, Y)
+
+    for col in range(Y.shape[1]):
+        keep = ~np.isnan(Y[:, col])
+        expected = linregress(x[keep], Y[keep, col])
+        assert slope[col] == pytest.approx(expected.slope)
+        assert intercept[col] == pytest.approx(expected.intercept)
+        assert r[col] == pytest.approx(expected.rvalue)
+        assert p_value[col] == pytest.approx(expected.pvalue, rel=1e-6, abs=1e-300)
+
+
+def test_perfect_fit_has_zero_p_value():
+    """Test that a noiseless line gives r = 1 and p = 0 rather than NaN"""
+    x = np.arange(10, dtype="float64")
+
+    slope, intercept, r, p_value = regress_columns(x, np.column_stack([3 * x + 7]))
+
+    assert slope[0] == pytest.approx(3)
+    assert intercept[0] == pytest.approx(7)
+    assert r[0] == 1.0
+    assert p_value[0] == 0.0
+
+
+def test_ordinal_days_matches_toordinal():
+    """Test that the vectorized day numbers equal Timestamp.toordinal"""
+    timestamps = pd.Series(pd.to_datetime(["2023-01-01 00:00", "2023-06-15 23:59", "2024-02-29 12:00"]))
+
+    assert list(ordinal_days(timestamps)) == [float(ts.toordinal()) for ts in timestamps]
@@ -0,0 +1,124 @@
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from regression_detector import ChangeDetector, RegressionMonitor, RunningStats
+
+START = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def durations(mean, count, seed=0):
+    rng = random.Random(seed)
+    return [rng.gauss(mean, 20) for _ in range(count)]
+
+
+def observations(values, job_name="job-a", target="build-a", offset=0):
+    return [(job_name, target, str(offset + i), START + timedelta(hours=offset + i), value)
+            for i, value in enumerate(values)]
+
+
+def test_running_stats_match_batch_mean_and_std():
+    """Test that Welford's running mean and std equal the two-pass values"""
+    values = durations(600, 200)
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+
+    mean = sum(values) / len(values)
+    std = (sum((v - mean) ** 2 for v in values) / (len(values) - 1)) ** 0.5
+    assert stats.mean == pytest.approx(mean)
+    assert stats.std == pytest.approx(std)
+
+
+def test_stable_durations_raise_no_alert():
+    """Test that noise around a steady level never triggers the detector"""
+    detector = ChangeDetector()
+
+    assert [detector.update(value) for value in durations(600, 500)] == [None] * 500
+
+
+@pytest.mark.parametrize("shift,direction", [(120, "slower"), (-120, "faster")])
+def test_level_shift_is_detected_within_a_few_builds(shift, direction):
+    """Test that a sustained shift of several standard deviations is flagged quickly"""
+    detector = ChangeDetector()
+    for value in durations(600, 50):
+        detector.update(value)
+
+    results = [detector.update(value) for value in durations(600 + shift, 10, seed=1)]
+
+    assert direction in results
+    assert results.index(direction) < 5
+
+
+def test_warmup_only_learns_the_baseline():
+    """Test that nothing is flagged before `warmup` values, however far they jump"""
+    detector = ChangeDetector(warmup=20)
+
+    assert [detector.update(value) for value in [600] * 10 + [6000] * 9] == [None] * 19
+
+
+def test_monitor_raises_one_alert_per_shift():
+    """Test that a shift alerts once and the baseline then restarts from the new level"""
+    monitor = RegressionMonitor()
+
+    alerts = monitor.feed(observations(durations(600, 60) + durations(900, 60, seed=1)))
+
+    assert [alert["direction"] for alert in alerts] == ["slower"]
+    assert 60 <= int(alerts[0]["job_id"]) < 65
+
+
+def test_monitor_state_round_trips_and_skips_seen_builds(tmp_path):
+    """Test that a reloaded monitor keeps its baseline and ignores re-fed builds"""
+    path = str(tmp_path / "regression_state.json")
+    values = durations(600, 60) + durations(900, 60, seed=1)
+    monitor = RegressionMonitor()
+    monitor.feed(observations(values[:60]))
+    monitor.save(path)
+
+    resumed = RegressionMonitor.load(path)
+    # The overlap with the first crawl must not count twice
+    alerts = resumed.feed(observations(values))
+
+    single_pass = RegressionMonitor()
+    assert alerts == single_pass.feed(observations(values))
+    assert resumed.detectors[("job-a", "build-a")].to_dict() == single_pass.detectors[("job-a", "build-a")].to_dict()
+
+
+def test_run_finishing_after_newer_runs_is_still_counted(tmp_path):
+    """Test that a run pending at one crawl is fed at the next even though newer runs were seen"""
+    path = str(tmp_path / "regression_state.json")
+    crawl = observations(durations(600, 30))
+    pending = crawl.pop(20)
+    monitor = RegressionMonitor()
+    monitor.feed(crawl)
+    monitor.save(path)
+
+    resumed = RegressionMonitor.load(path)
+    resumed.feed(crawl + [pending])
+
+    assert resumed.detectors[("job-a", "build-a")].seen_ids == {str(i) for i in range(30)}
+
+
+def test_jobs_keep_separate_baselines():
+    """Test that one job's slower builds do not shift another job's baseline"""
+    monitor = RegressionMonitor()
+
+    alerts = monitor.feed(observations(durations(600, 60), job_name="master")
+                          + observations(durations(900, 60, seed=1), job_name="release-4.16"))
+
+    assert alerts == []
+    assert monitor.detectors[("master", "build-a")].stats.mean == pytest.approx(600, abs=10)
+    assert monitor.detectors[("release-4.16", "build-a")].stats.mean == pytest.approx(900, abs=10)
+
+
+def test_old_state_without_jobs_starts_over(tmp_path):
+    """Test that a state file keyed by target only is discarded rather than misread"""
+    path = tmp_path / "regression_state.json"
+    path.write_text('{"targets": {"build-a": {}}}')
+
+    assert RegressionMonitor.load(str(path)).detectors == {}
@@ -0,0 +1,71 @@
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import getBuildData
+from getBuildData import MAX_SEEK_PROBES, seek_build_id
+
+JOB = "periodic-ci-test"
+PAGE_SIZE = 20
+NEWEST_START = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+class FakeHistory:
+    """Prow job history: IDs grow with start time, with uneven gaps and an uneven run rate."""
+
+    def __init__(self, runs, seed=0):
+        rng = random.Random(seed)
+        build_id, start = 1_800_000_000_000_000_000, NEWEST_START
+        self.builds = []
+        for _ in range(runs):
+            self.builds.insert(0, {"ID": str(build_id), "Started": start.isoformat().replace("+00:00", "Z")})
+            build_id -= rng.randint(1, 10_000_000_000_000)
+            start -= timedelta(minutes=rng.choice([5, 30, 240, 1440]))
+        self.fetches = 0
+
+    def page(self, url):
+        """The page behind `url`: the newest runs, or those older than ?buildId=N."""
+        self.fetches += 1
+        builds = self.builds
+        if "?buildId=" in url:
+            cursor = int(url.split("?buildId=")[1])
+            builds = [build for build in builds if int(build["ID"]) < cursor]
+        return list(reversed(builds[-PAGE_SIZE:]))
+
+    def starts(self):
+        return [(int(build["ID"]), getBuildData.parse_started(build)) for build in self.builds]
+
+
+@pytest.fixture
+def history(monkeypatch):
+    history = FakeHistory(runs=3000)
+    monkeypatch.setattr(getBuildData, "fetch_page", lambda url: url)
+    monkeypatch.setattr(getBuildData, "extract_all_builds", history.page)
+    return history
+
+
+@pytest.mark.parametrize("days_back", [10, 60, 300, 700])
+def test_cursor_skips_only_runs_after_until(history, days_back):
+    """Test that the cursor skips no run started before `until` and wastes at most one page"""
+    until = NEWEST_START - timedelta(days=days_back)
+
+    cursor = seek_build_id(JOB, until)
+
+    skipped_in_window = [build_id for build_id, start in history.starts() if build_id >= cursor and start < until]
+    read_outside_window = [build_id for build_id, start in history.starts() if build_id < cursor and start >= until]
+    assert skipped_in_window == []
+    assert len(read_outside_window) < PAGE_SIZE
+    assert history.fetches <= MAX_SEEK_PROBES + 1
+
+
+def test_no_seek_when_newest_page_reaches_until(history):
+    """Test that no cursor is returned when the first page already covers `until`"""
+    until = getBuildData.parse_started(history.builds[-5])
+
+    assert seek_build_id(JOB, until) is None
+    assert history.fetches == 1